@@ -3,16 +3,17 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import get_async_session
+from app.core.pagination import Cursor, decode_cursor
 from app.models.user import User
-from app.services.user import get_user_by_email
+from app.services.user import get_active_user_cached
 
 security = HTTPBearer()
 
-def get_current_user(
-    db: Session = Depends(get_session),
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_session),
     token: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     try:
@@ -31,7 +32,7 @@ def get_current_user(
             detail="Could not validate credentials",
         )
     
-    user = get_user_by_email(db, email=token_data)
+    user = await db.run_sync(get_active_user_cached, email=token_data)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -39,3 +40,16 @@ def get_current_user(
         raise HTTPException(status_code=400, detail="Inactive user")
         
     return user
+
+
+async def get_cursor(cursor: Optional[str] = None) -> Optional[Cursor]:
+    """Decode the optional `cursor` query parameter used for keyset pagination."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
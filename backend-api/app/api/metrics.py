@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition for every worker process."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,10 +1,10 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
-from app.core.database import get_session
-from app.services.user import verify_password, get_user_by_email
-from app.core.security import create_access_token
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session
+from app.services.user import get_user_by_email, rehash_user_password
+from app.core.security import HashingQueueFull, create_access_token, verify_password_async
 from app.models.user import UserResponse
 from app.api.deps import get_current_user
 from app.models.user import User
@@ -12,27 +12,43 @@ from app.models.user import User
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-def get_me(
+async def get_me(
     current_user: User = Depends(get_current_user)
 ) -> UserResponse:
     """Get current authenticated user"""
     return current_user
 
 @router.post("/login")
-def login(
-    db: Session = Depends(get_session),
+async def login(
+    db: AsyncSession = Depends(get_async_session),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
-    user = get_user_by_email(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await db.run_sync(get_user_by_email, email=form_data.username)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password_async(form_data.password, user.hashed_password)
+        except HashingQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login attempts in progress, try again shortly",
+                headers={"Retry-After": "1"}
+            )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password"
         )
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+
+    access_token = create_access_token(user.email)
+
+    # Transparently upgrade hashes made with a legacy scheme or fewer rounds
+    if new_hash:
+        await db.run_sync(rehash_user_password, user_id=user.id, hashed_password=new_hash)
     
     return {
-        "access_token": create_access_token(user.email),
+        "access_token": access_token,
         "token_type": "bearer",
     }
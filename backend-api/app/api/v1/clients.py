@@ -1,42 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.models.client import Client, ClientCreate, ClientUpdate, ClientResponse, ClientFiltersMeta
 from app.models.user import User
-from app.models.response_models import PaginatedResponse, Meta
-from app.api.deps import get_current_user
+from app.models.response_models import ImportResult, PaginatedResponse, Meta
+from app.api.deps import get_current_user, get_cursor
+from app.core.pagination import Cursor, next_cursor
+from app.core.etag import compute_etag, is_not_modified, not_modified, query_key, set_etag
+from app.core.instrumentation import request_budget
+from app.services.user import get_data_version
+from app.services.csv_import import import_csv_async
 from app.services.client import (
-    get_client, get_clients, create_client, update_client, delete_client
+    get_client, get_clients, get_client_watermark,
+    create_client, update_client, delete_client
 )
 
 router = APIRouter()
 
 @router.post("/", response_model=ClientResponse, status_code=status.HTTP_201_CREATED)
-def create_new_client(
+async def create_new_client(
     client: ClientCreate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> ClientResponse:
-    return create_client(db=db, client=client, user_id=current_user.id)
+    return await db.run_sync(create_client, client=client, user_id=current_user.id)
+
+@router.post("/import", response_model=ImportResult)
+# Statements and time grow with the file (one INSERT per batch), so no budget
+@request_budget(max_queries=0, max_ms=0)
+async def import_clients(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+) -> ImportResult:
+    """
+    Import clients from a CSV file with a header row (columns as in ClientCreate).
+    Valid rows are created in batches; invalid rows are skipped and reported by line.
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return await import_csv_async(db, kind="clients", stream=stream, user_id=current_user.id)
 
 @router.get("/", response_model=PaginatedResponse[ClientResponse])
-def read_clients(
+async def read_clients(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
-    db: Session = Depends(get_session),
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> PaginatedResponse[ClientResponse]:
     """
     Get all clients for the current user with pagination.
     """
-    clients, total_count, all_count = get_clients(
-        db=db,
+    version = await db.run_sync(get_data_version, user_id=current_user.id)
+    etag = compute_etag("clients", current_user.id, query_key(request), version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    clients, total_count, all_count = await db.run_sync(
+        get_clients,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
-        search=search
+        search=search,
+        after=after
     )
 
     # Calculate page number (1-indexed)
@@ -51,40 +83,52 @@ def read_clients(
             total=total_count,
             page=page,
             limit=limit,
+            next_cursor=next_cursor(clients, limit),
             filters=client_filters.model_dump()
         )
     )
 
 @router.get("/{client_id}", response_model=ClientResponse)
-def read_client(
+async def read_client(
     client_id: int,
-    db: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> ClientResponse:
-    client = get_client(db, client_id=client_id, user_id=current_user.id)
+    watermark = await db.run_sync(get_client_watermark, client_id=client_id, user_id=current_user.id)
+    if not watermark:
+        raise HTTPException(status_code=404, detail="Client not found")
+
+    etag = compute_etag("client", client_id, watermark)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    client = await db.run_sync(get_client, client_id=client_id, user_id=current_user.id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     return client
 
 @router.put("/{client_id}", response_model=ClientResponse)
-def update_existing_client(
+async def update_existing_client(
     client_id: int,
     client_update: ClientUpdate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> ClientResponse:
-    client = update_client(db, client_id=client_id, client_update=client_update, user_id=current_user.id)
+    client = await db.run_sync(update_client, client_id=client_id, client_update=client_update, user_id=current_user.id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     return client
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_client(
+async def delete_existing_client(
     client_id: int,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> None:
-    success = delete_client(db, client_id=client_id, user_id=current_user.id)
+    success = await db.run_sync(delete_client, client_id=client_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Client not found")
     return None
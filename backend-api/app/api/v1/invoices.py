@@ -1,44 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from typing import Optional
-from app.core.database import get_session
-from app.models.invoice import Invoice, InvoiceCreate, InvoiceUpdate, InvoiceResponse, InvoiceFiltersMeta
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Literal, Optional, Union
+from app.core.database import get_async_session
+from app.models.invoice import (
+    Invoice, InvoiceCreate, InvoiceUpdate, InvoiceResponse, InvoiceFiltersMeta,
+    InvoiceBulkCreate, InvoiceBulkResponse, InvoicePdfBatch, InvoiceSummary
+)
 from app.models.user import User
 from app.models.response_models import PaginatedResponse, Meta
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_cursor
+from app.core.pagination import Cursor, next_cursor
+from app.core.etag import compute_etag, is_not_modified, not_modified, query_key, set_etag
+from app.core.instrumentation import request_budget
 from app.services.invoice import (
-    get_invoice, get_invoices, create_invoice, update_invoice, delete_invoice
+    get_invoice, get_invoices, get_invoice_watermark,
+    create_invoice, create_invoices_bulk, update_invoice, delete_invoice,
+    stream_invoices_for_export, EXPORT_COLUMNS, get_invoice_pdf_payloads, INVOICE_SUMMARY_FIELDS
 )
+from app.services.pdf import render_invoice_pdf, render_invoice_pdf_zip
+from app.services.user import get_data_version
 
 router = APIRouter()
 
 @router.post("/", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED)
-def create_new_invoice(
+async def create_new_invoice(
     invoice: InvoiceCreate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> InvoiceResponse:
-    return create_invoice(db=db, invoice=invoice, user_id=current_user.id)
+    return await db.run_sync(create_invoice, invoice=invoice, user_id=current_user.id)
+
+@router.post("/bulk", response_model=InvoiceBulkResponse)
+async def create_invoices_in_bulk(
+    payload: InvoiceBulkCreate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+) -> InvoiceBulkResponse:
+    """
+    Create many invoices in a single transaction.
+    Returns a result per payload with either the new invoice id or an error.
+    """
+    results = await db.run_sync(create_invoices_bulk, invoices=payload.invoices, user_id=current_user.id)
+    created_count = sum(1 for result in results if result.id is not None)
 
-@router.get("/", response_model=PaginatedResponse[InvoiceResponse])
-def list_invoices(
+    return InvoiceBulkResponse(
+        created_count=created_count,
+        error_count=len(results) - created_count,
+        results=results
+    )
+
+# Unset summary fields are left out of the response (sparse fieldsets)
+@router.get(
+    "/",
+    response_model=PaginatedResponse[Union[InvoiceResponse, InvoiceSummary]],
+    response_model_exclude_unset=True
+)
+# Budget: watermark, page, items, clients and counts, plus the user lookup
+@request_budget(max_queries=6, max_ms=500)
+async def list_invoices(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
     status: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_session),
+    view: Literal["full", "summary"] = "full",
+    fields: Optional[str] = None,
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
-) -> PaginatedResponse[InvoiceResponse]:
+) -> PaginatedResponse[Union[InvoiceResponse, InvoiceSummary]]:
     """
     Get all invoices for the current user with pagination.
+    `view=summary` returns narrow rows (no items/client objects, with item_count);
+    `fields=a,b,c` returns only those summary fields (plus id).
     """
-    invoices, total_count, all_count, draft_count, sent_count, paid_count, cancelled_count = get_invoices(
-        db,
+    summary_fields = None
+    if fields:
+        summary_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in summary_fields if field not in INVOICE_SUMMARY_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {unknown[0]}")
+    elif view == "summary":
+        summary_fields = list(INVOICE_SUMMARY_FIELDS)
+
+    version = await db.run_sync(get_data_version, user_id=current_user.id)
+    etag = compute_etag("invoices", current_user.id, query_key(request), version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    invoices, total_count, all_count, draft_count, sent_count, paid_count, cancelled_count = await db.run_sync(
+        get_invoices,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
         status=status,
-        search=search
+        search=search,
+        after=after,
+        fields=summary_fields
     )
 
     # Calculate page number (1-indexed)
@@ -53,46 +118,161 @@ def list_invoices(
         cancelled_count=cancelled_count
     )
     
+    # Ranked search results are paginated by offset only
+    cursor = next_cursor(invoices, limit) if not search or after else None
+    if summary_fields:
+        output_fields = dict.fromkeys(["id", *summary_fields])
+        invoices = [
+            InvoiceSummary(**{field: row._mapping[field] for field in output_fields})
+            for row in invoices
+        ]
+
     return PaginatedResponse(
         data=invoices,
         meta=Meta(
             total=total_count,
             page=page,
             limit=limit,
+            next_cursor=cursor,
             filters=invoice_filters.model_dump()
         )
     )
 
+async def _csv_chunks(batches):
+    header = [column.key for column in EXPORT_COLUMNS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([row[key] for key in header] for row in batch)
+        yield buffer.getvalue()
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+async def _ndjson_chunks(batches):
+    async for batch in batches:
+        yield "".join(json.dumps(dict(row), default=_json_default) + "\n" for row in batch)
+
+@router.get("/export")
+async def export_invoices(
+    format: Literal["csv", "ndjson"] = "csv",
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Stream the current user's invoices created in [from, to) as CSV or NDJSON.
+    """
+    batches = stream_invoices_for_export(db, user_id=current_user.id, date_from=date_from, date_to=date_to)
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson_chunks(batches),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="invoices.ndjson"'}
+        )
+    return StreamingResponse(
+        _csv_chunks(batches),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="invoices.csv"'}
+    )
+
+# Rendering is awaited on the process pool; the database work happens in these dependencies
+async def get_pdf_payload(
+    invoice_id: int,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+) -> dict:
+    payloads = await db.run_sync(get_invoice_pdf_payloads, [invoice_id], user_id=current_user.id)
+    if not payloads:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return payloads[0]
+
+async def get_pdf_batch_payloads(
+    batch: InvoicePdfBatch,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+) -> List[dict]:
+    payloads = await db.run_sync(get_invoice_pdf_payloads, batch.invoice_ids, user_id=current_user.id)
+    found = {payload["id"] for payload in payloads}
+    missing = [invoice_id for invoice_id in batch.invoice_ids if invoice_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Invoice {missing[0]} not found")
+    return payloads
+
+@router.post("/pdf/batch")
+async def download_invoice_pdf_batch(
+    payloads: List[dict] = Depends(get_pdf_batch_payloads)
+) -> Response:
+    """
+    Render several invoices in parallel and return them as a zip archive.
+    """
+    archive = await render_invoice_pdf_zip(payloads)
+    return Response(
+        archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="invoices.zip"'}
+    )
+
+@router.get("/{invoice_id}/pdf")
+async def download_invoice_pdf(
+    payload: dict = Depends(get_pdf_payload)
+) -> FileResponse:
+    """
+    Download an invoice as PDF. Rendered files are cached on disk by content,
+    so repeat downloads are served from the cache until the invoice changes.
+    """
+    path = await render_invoice_pdf(payload)
+    return FileResponse(path, media_type="application/pdf", filename=f"invoice-{payload['id']}.pdf")
+
 @router.get("/{invoice_id}", response_model=InvoiceResponse)
-def read_invoice(
+async def read_invoice(
     invoice_id: int,
-    db: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> InvoiceResponse:
-    invoice = get_invoice(db, invoice_id=invoice_id, user_id=current_user.id)
+    watermark = await db.run_sync(get_invoice_watermark, invoice_id=invoice_id, user_id=current_user.id)
+    if not watermark:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+
+    etag = compute_etag("invoice", invoice_id, *watermark)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    invoice = await db.run_sync(get_invoice, invoice_id=invoice_id, user_id=current_user.id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     return invoice
 
 @router.put("/{invoice_id}", response_model=InvoiceResponse)
-def update_existing_invoice(
+async def update_existing_invoice(
     invoice_id: int,
     invoice_update: InvoiceUpdate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> InvoiceResponse:
-    invoice = update_invoice(db, invoice_id=invoice_id, invoice_update=invoice_update, user_id=current_user.id)
+    invoice = await db.run_sync(update_invoice, invoice_id=invoice_id, invoice_update=invoice_update, user_id=current_user.id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     return invoice
 
 @router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_invoice(
+async def delete_existing_invoice(
     invoice_id: int,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> None:
-    success = delete_invoice(db, invoice_id=invoice_id, user_id=current_user.id)
+    success = await db.run_sync(delete_invoice, invoice_id=invoice_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Invoice not found")
     return None
@@ -1,42 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.models.product import Product, ProductCreate, ProductUpdate, ProductResponse, ProductFiltersMeta
 from app.models.user import User
-from app.models.response_models import PaginatedResponse, Meta
-from app.api.deps import get_current_user
+from app.models.response_models import ImportResult, PaginatedResponse, Meta
+from app.api.deps import get_current_user, get_cursor
+from app.core.pagination import Cursor, next_cursor
+from app.core.etag import compute_etag, is_not_modified, not_modified, query_key, set_etag
+from app.core.instrumentation import request_budget
+from app.services.user import get_data_version
+from app.services.csv_import import import_csv_async
 from app.services.product import (
-    get_product, get_products, create_product, update_product, delete_product
+    get_product, get_products, get_product_watermark,
+    create_product, update_product, delete_product
 )
 
 router = APIRouter()
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_new_product(
+async def create_new_product(
     product: ProductCreate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> ProductResponse:
-    return create_product(db=db, product=product, user_id=current_user.id)
+    return await db.run_sync(create_product, product=product, user_id=current_user.id)
+
+@router.post("/import", response_model=ImportResult)
+# Statements and time grow with the file (one INSERT per batch), so no budget
+@request_budget(max_queries=0, max_ms=0)
+async def import_products(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+) -> ImportResult:
+    """
+    Import products from a CSV file with a header row (columns as in ProductCreate).
+    Valid rows are created in batches; invalid rows are skipped and reported by line.
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return await import_csv_async(db, kind="products", stream=stream, user_id=current_user.id)
 
 @router.get("/", response_model=PaginatedResponse[ProductResponse])
-def read_products(
+async def read_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
-    db: Session = Depends(get_session),
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> PaginatedResponse[ProductResponse]:
     """
     Get all products for the current user with pagination.
     """
-    products, total_count, all_count = get_products(
-        db=db,
+    version = await db.run_sync(get_data_version, user_id=current_user.id)
+    etag = compute_etag("products", current_user.id, query_key(request), version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    products, total_count, all_count = await db.run_sync(
+        get_products,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
-        search=search
+        search=search,
+        after=after
     )
     
     # Calculate page number (1-indexed)
@@ -51,40 +83,52 @@ def read_products(
             total=total_count,
             page=page,
             limit=limit,
+            next_cursor=next_cursor(products, limit),
             filters=product_filters.model_dump()
         )
     )
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def read_product(
+async def read_product(
     product_id: int,
-    db: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> ProductResponse:
-    product = get_product(db, product_id=product_id, user_id=current_user.id)
+    watermark = await db.run_sync(get_product_watermark, product_id=product_id, user_id=current_user.id)
+    if not watermark:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    etag = compute_etag("product", product_id, watermark)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    product = await db.run_sync(get_product, product_id=product_id, user_id=current_user.id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.put("/{product_id}", response_model=ProductResponse)
-def update_existing_product(
+async def update_existing_product(
     product_id: int,
     product_update: ProductUpdate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> ProductResponse:
-    product = update_product(db, product_id=product_id, product_update=product_update, user_id=current_user.id)
+    product = await db.run_sync(update_product, product_id=product_id, product_update=product_update, user_id=current_user.id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_product(
+async def delete_existing_product(
     product_id: int,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> None:
-    success = delete_product(db, product_id=product_id, user_id=current_user.id)
+    success = await db.run_sync(delete_product, product_id=product_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Product not found")
     return None
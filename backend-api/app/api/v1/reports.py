@@ -0,0 +1,99 @@
+from datetime import date, datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.services.client import get_client
+from app.services.report import AGING_BUCKETS, days_past_due, get_aging_by_client, get_aging_invoices
+from pydantic import BaseModel
+
+router = APIRouter()
+
+class AgingBuckets(BaseModel):
+    current: float = 0.0
+    days_1_30: float = 0.0
+    days_31_60: float = 0.0
+    days_61_90: float = 0.0
+    days_90_plus: float = 0.0
+    total: float = 0.0
+    invoice_count: int = 0
+
+class ClientAging(AgingBuckets):
+    client_id: int
+    client_name: str
+    currency: str
+
+class CurrencyAging(AgingBuckets):
+    currency: str
+
+class AgingInvoice(BaseModel):
+    id: int
+    due_date: datetime
+    total_amount: float
+    currency: str
+    days_past_due: int
+    bucket: str
+
+class AgingReport(BaseModel):
+    as_of: date
+    clients: List[ClientAging]
+    totals: List[CurrencyAging]  # One entry per currency; amounts are never converted
+    invoices: Optional[List[AgingInvoice]] = None  # Drill-down, only when client_id is given
+
+@router.get("/aging", response_model=AgingReport)
+async def get_aging_report(
+    as_of: Optional[date] = None,
+    client_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Accounts-receivable aging of outstanding ('sent') invoices, bucketed by
+    days past due, per client and in total. Pass client_id to also list that
+    client's outstanding invoices.
+    """
+    as_of = as_of or datetime.utcnow().date()
+    if client_id is not None and not await db.run_sync(get_client, client_id=client_id, user_id=current_user.id):
+        raise HTTPException(status_code=404, detail="Client not found")
+
+    bucket_names = [name for name, _, _ in AGING_BUCKETS]
+    clients = []
+    totals = {}
+    for row in await db.run_sync(get_aging_by_client, user_id=current_user.id, as_of=as_of, client_id=client_id):
+        amounts = {name: getattr(row, name) for name in bucket_names}
+        clients.append(ClientAging(
+            client_id=row.client_id,
+            client_name=row.client_name,
+            currency=row.currency,
+            invoice_count=row.invoice_count,
+            total=sum(amounts.values()),
+            **amounts
+        ))
+        currency_total = totals.setdefault(row.currency, CurrencyAging(currency=row.currency))
+        for name, amount in amounts.items():
+            setattr(currency_total, name, getattr(currency_total, name) + amount)
+        currency_total.total += sum(amounts.values())
+        currency_total.invoice_count += row.invoice_count
+
+    invoices = None
+    if client_id is not None:
+        invoices = [
+            AgingInvoice(
+                id=row.id,
+                due_date=row.due_date,
+                total_amount=row.total_amount,
+                currency=row.currency,
+                days_past_due=days_past_due(row.due_date, as_of),
+                bucket=row.bucket
+            )
+            for row in await db.run_sync(get_aging_invoices, user_id=current_user.id, client_id=client_id, as_of=as_of)
+        ]
+
+    return AgingReport(
+        as_of=as_of,
+        clients=clients,
+        totals=sorted(totals.values(), key=lambda total: total.currency),
+        invoices=invoices
+    )
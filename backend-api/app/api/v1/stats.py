@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select, func
-from app.core.database import get_session
+from datetime import date
+from typing import Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import async_engine, engine, get_async_session, pool_stats
+from app.core.instrumentation import request_budget
+from app.core.security import hashing_stats
 from app.api.deps import get_current_user
 from app.models.user import User
-from app.models.client import Client
-from app.models.product import Product
-from app.models.invoice import Invoice, InvoiceFiltersMeta
+from app.models.invoice import InvoiceFiltersMeta
+from app.services.rollup import get_revenue_series
+from app.services.stats import get_dashboard_counts
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -18,40 +22,94 @@ class DashboardStats(BaseModel):
     invoices_status_counts: InvoiceFiltersMeta
 
 @router.get("/", response_model=DashboardStats)
-def get_dashboard_stats(
-    db: Session = Depends(get_session),
+# Budget: the counts query (on a cache miss) plus the user lookup
+@request_budget(max_queries=2, max_ms=250)
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    # Users count (all users in system)
-    users_count = db.exec(select(func.count(User.id))).one()
-
-    # Clients count (scoped to user)
-    clients_count = db.exec(select(func.count(Client.id)).where(Client.user_id == current_user.id)).one()
-
-    # Products count (scoped to user)
-    products_count = db.exec(select(func.count(Product.id)).where(Product.user_id == current_user.id)).one()
-
-    # Invoices count (scoped to user)
-    invoices_count = db.exec(select(func.count(Invoice.id)).where(Invoice.user_id == current_user.id)).one()
-
-    # Invoice status counts
-    draft_count = db.exec(select(func.count(Invoice.id)).where(Invoice.user_id == current_user.id, Invoice.status == "draft")).one()
-    sent_count = db.exec(select(func.count(Invoice.id)).where(Invoice.user_id == current_user.id, Invoice.status == "sent")).one()
-    paid_count = db.exec(select(func.count(Invoice.id)).where(Invoice.user_id == current_user.id, Invoice.status == "paid")).one()
-    cancelled_count = db.exec(select(func.count(Invoice.id)).where(Invoice.user_id == current_user.id, Invoice.status == "cancelled")).one()
-
-    invoice_filters = InvoiceFiltersMeta(
-        all_count=invoices_count,
-        draft_count=draft_count,
-        sent_count=sent_count,
-        paid_count=paid_count,
-        cancelled_count=cancelled_count
-    )
+    # One aggregate query, cached per user and invalidated by writes
+    return DashboardStats(**await db.run_sync(get_dashboard_counts, user_id=current_user.id))
+
+class RevenuePoint(BaseModel):
+    period: date  # First day of the day/week/month
+    status: str
+    currency: str
+    invoice_count: int
+    total_amount: float
+
+class RevenueSeries(BaseModel):
+    granularity: str
+    data: List[RevenuePoint]
+
+@router.get("/revenue", response_model=RevenueSeries)
+async def get_revenue(
+    granularity: Literal["day", "week", "month"] = "day",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Invoice totals per day, week or month, by status and currency, for invoices
+    created between `from` and `to` (inclusive). Served from the daily rollups.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
 
-    return DashboardStats(
-        users_count=users_count,
-        clients_count=clients_count,
-        products_count=products_count,
-        invoices_count=invoices_count,
-        invoices_status_counts=invoice_filters
+    rows = await db.run_sync(
+        get_revenue_series,
+        user_id=current_user.id,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to
     )
+    return RevenueSeries(
+        granularity=granularity,
+        data=[
+            RevenuePoint(
+                period=row.period,
+                status=row.status,
+                currency=row.currency,
+                invoice_count=row.invoice_count,
+                total_amount=round(row.total_amount, 2)
+            )
+            for row in rows
+        ]
+    )
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_seconds_total: float
+    checkout_wait_seconds_max: float
+
+@router.get("/database", response_model=Dict[str, PoolStats])
+async def get_database_pool_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Connection pool occupancy and checkout counters for this worker process.
+    `async` serves API requests; `sync` is used by in-process scripts and jobs.
+    """
+    return {
+        "async": pool_stats(async_engine.sync_engine),
+        "sync": pool_stats(engine),
+    }
+
+class HashingStats(BaseModel):
+    workers: int
+    max_queue: int
+    queue_depth: int  # Password hashes queued or running
+    rejected: int
+
+@router.get("/hashing", response_model=HashingStats)
+async def get_hashing_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Password hashing executor load for this worker process."""
+    return hashing_stats()
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.models.user import User, UserCreate, UserUpdate, UserResponse, UserFiltersMeta
 from app.models.response_models import PaginatedResponse, Meta
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_cursor
+from app.core.pagination import Cursor, next_cursor
+from app.core.security import HashingQueueFull, get_password_hash_async
 from app.services.user import (
     get_user, get_users, create_user, update_user, delete_user,
     get_user_by_email
@@ -17,10 +19,20 @@ router = APIRouter()
 def validate_email(email: str) -> bool:
     return bool(re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$').match(email))
 
+async def _hash_password(password: str) -> str:
+    try:
+        return await get_password_hash_async(password)
+    except HashingQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_new_user(
+async def create_new_user(
     user: UserCreate, 
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> UserResponse:
     # Validate email format
     if not validate_email(user.email):
@@ -30,23 +42,25 @@ def create_new_user(
         )
 
     # Check if email already exists
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await db.run_sync(get_user_by_email, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    return create_user(db=db, user=user)
+    hashed_password = await _hash_password(user.password)
+    return await db.run_sync(create_user, user=user, hashed_password=hashed_password)
 
 
 @router.get("/", response_model=PaginatedResponse[UserResponse])
-def read_users(
+async def read_users(
     skip: int = 0, 
     limit: int = 100,
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_session),
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> PaginatedResponse[UserResponse]:
     """
@@ -58,13 +72,15 @@ def read_users(
         - limit: Maximum records to return (default: 100)
         - search: Search string to filter by email or full_name
         - is_active: Filter by active status (true/false)
+        - cursor: Opaque cursor from meta.next_cursor for keyset pagination (skip is ignored)
     """
-    users, total_count, all_count, active_count, inactive_count = get_users(
-        db, 
+    users, total_count, all_count, active_count, inactive_count = await db.run_sync(
+        get_users,
         skip=skip, 
         limit=limit,
         search=search,
-        is_active=is_active
+        is_active=is_active,
+        after=after
     )
     
     # Calculate page number (1-indexed)
@@ -83,18 +99,19 @@ def read_users(
             total=total_count,
             page=page,
             limit=limit,
+            next_cursor=next_cursor(users, limit),
             filters=user_filters.model_dump()  # Convert to dict
         )
     )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def read_user(
+async def read_user(
     user_id: int, 
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> UserResponse:
-    db_user = get_user(db, user_id=user_id)
+    db_user = await db.run_sync(get_user, user_id=user_id)
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,13 +121,14 @@ def read_user(
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_existing_user(
+async def update_existing_user(
     user_id: int, 
     user: UserUpdate, 
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> UserResponse:
-    db_user = update_user(db, user_id=user_id, user_update=user)
+    hashed_password = await _hash_password(user.password) if user.password else None
+    db_user = await db.run_sync(update_user, user_id=user_id, user_update=user, hashed_password=hashed_password)
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -120,12 +138,12 @@ def update_existing_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_user(
+async def delete_existing_user(
     user_id: int, 
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ) -> None:
-    success = delete_user(db, user_id=user_id)
+    success = await db.run_sync(delete_user, user_id=user_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,15 +1,21 @@
 import sys
 import os
+import time
 
 # Add the app directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 import click
 from sqlmodel import Session
+from app.core.config import settings
 from app.core.database import engine
 from app.services.user import create_user as create_user_db, get_user_by_email, get_users
 from app.models.user import UserCreate
-from app.core.seeder import seed_users, seed_clients
+from app.core.seeder import BULK_PASSWORD, seed_bulk, seed_users, seed_clients
+from app.services.recurring import generate_recurring_invoices
+from app.services.rollup import rebuild_rollups as rebuild_rollups_db
+from app.services.csv_import import IMPORT_BATCH_SIZE, IMPORT_KINDS, import_csv
+from app.services.pdf import prune_pdf_cache as prune_pdf_cache_dir
 
 
 # === USER COMMANDS ===
@@ -97,8 +103,15 @@ def make_migration(message):
 
 
 @cli.command()
-def seed():
+@click.option('--scale', type=int, default=None, help='Bulk-seed N units of realistic data (10 users, 500 clients, 100 products, 10k invoices each)')
+@click.option('--workers', type=int, default=os.cpu_count(), show_default=True, help='Worker processes for --scale')
+@click.option('--seed', 'random_seed', type=int, default=42, show_default=True, help='Random seed for --scale (also names the users)')
+def seed(scale, workers, random_seed):
     """Seed the database with test data"""
+    if scale:
+        _seed_bulk(scale, workers, random_seed)
+        return
+
     with Session(engine) as session:
         user_count = seed_users(session)
         click.echo(f"✅ Users seeded! Created {user_count} new users.")
@@ -109,5 +122,88 @@ def seed():
         click.echo(f"✅ Seeding completed! Total: {user_count} users, {client_count} clients.")
 
 
+def _seed_bulk(scale, workers, random_seed):
+    """Internal function to bulk-seed with COPY from worker processes"""
+    start = time.perf_counter()
+    with Session(engine) as session:
+        try:
+            counts = seed_bulk(
+                session, scale=scale, workers=workers, seed=random_seed,
+                progress=lambda message: click.echo(f"   {message} ({time.perf_counter() - start:.0f}s)")
+            )
+        except ValueError as e:
+            click.echo(f"❌ {e}")
+            return
+    click.echo(f"✅ Bulk seeding completed in {time.perf_counter() - start:.0f}s!")
+    for table, count in counts.items():
+        click.echo(f"   {table}: {count}")
+    click.echo(f"   Log in as seed{random_seed}-tenant0@example.com / {BULK_PASSWORD}")
+
+
+def _import_csv(path, kind, user_email, batch_size):
+    """Internal function to import clients or products from a CSV file"""
+    if kind is None:
+        kind = os.path.splitext(os.path.basename(path))[0].lower()
+        if kind not in IMPORT_KINDS:
+            click.echo(f"❌ Cannot tell what {path} contains; pass --kind {'/'.join(IMPORT_KINDS)}")
+            return False
+
+    with Session(engine) as session:
+        user = get_user_by_email(session, user_email)
+        if not user:
+            click.echo(f"❌ User with email {user_email} not found!")
+            return False
+
+        # newline="" lets the csv module handle quoted line breaks; utf-8-sig drops a BOM
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            result = import_csv(session, kind, stream, user_id=user.id, batch_size=batch_size)
+
+    click.echo(f"✅ Imported {result.created_count} {kind}, {result.error_count} rows rejected.")
+    for row_error in result.errors:
+        click.echo(f"   line {row_error.line}: {row_error.error}")
+    if result.errors_truncated:
+        click.echo(f"   ... and {result.error_count - len(result.errors)} more")
+    return True
+
+
+@cli.command(name='import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--kind', type=click.Choice(list(IMPORT_KINDS)), default=None, help='What the file contains (default: from the file name)')
+@click.option('--user-email', required=True, help='Owner of the imported rows')
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True, help='Rows validated and inserted per transaction')
+def import_file(path, kind, user_email, batch_size):
+    """Import clients or products from a CSV file with a header row"""
+    _import_csv(path, kind, user_email, batch_size)
+
+
+# === INVOICE COMMANDS ===
+@cli.command()
+@click.option('--batch-size', default=500, show_default=True, help='Recurring invoices generated per transaction')
+def generate_recurring(batch_size):
+    """Generate due occurrences of recurring invoices (safe to run in parallel)"""
+    with Session(engine) as session:
+        count = generate_recurring_invoices(session, batch_size=batch_size)
+        click.echo(f"✅ Recurring invoices generated! Processed {count} due occurrences.")
+
+
+
+@cli.command()
+@click.option('--user-id', type=int, default=None, help='Only rebuild this user\'s rollups')
+def rebuild_rollups(user_id):
+    """Recompute the daily invoice rollups from the invoices table"""
+    with Session(engine) as session:
+        count = rebuild_rollups_db(session, user_id=user_id)
+        click.echo(f"✅ Invoice rollups rebuilt! Wrote {count} daily rows.")
+
+
+@cli.command()
+@click.option('--max-mb', type=float, default=settings.PDF_CACHE_MAX_MB, show_default=True, help='Evict least recently served PDFs above this size (0: no cap)')
+@click.option('--max-age-days', type=float, default=settings.PDF_CACHE_MAX_AGE_DAYS, show_default=True, help='Evict PDFs not served for this long (0: no cap)')
+def prune_pdf_cache(max_mb, max_age_days):
+    """Evict cached invoice PDFs over the size or age cap"""
+    removed, removed_bytes = prune_pdf_cache_dir(settings.PDF_CACHE_DIR, max_mb * 1024 * 1024, max_age_days * 86400)
+    click.echo(f"✅ PDF cache pruned! Removed {removed} files ({removed_bytes / 1024 / 1024:.1f} MB).")
+
+
 if __name__ == '__main__':
     cli()
\ No newline at end of file
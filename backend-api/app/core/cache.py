@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import asyncpg
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after `ttl` seconds.
+
+    Each worker process has its own copy, so an invalidation only reaches the
+    process that made the write; other workers catch up within `ttl`.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, name: Optional[str] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Lookups are counted per cache name (hit ratio in /metrics)
+        self._hits = CACHE_REQUESTS.labels(name, "hit") if name else None
+        self._misses = CACHE_REQUESTS.labels(name, "miss") if name else None
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = _MISSING
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+        if self._hits is not None:
+            (self._misses if entry is _MISSING else self._hits).inc()
+        return default if entry is _MISSING else entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+async def listen_for_invalidations(
+    cache: TTLCache, channel: str, key: Callable[[str], Hashable] = str, retry_seconds: float = 5.0
+) -> None:
+    """
+    Drop the `cache` entries named by NOTIFY payloads on `channel` (converted
+    with `key`), so writes made by any worker reach this one. Runs until
+    cancelled, reconnecting if the connection drops; the cache is cleared on
+    every (re)connect since notifications may have been missed in between.
+    """
+    label = cache.name or channel
+    while True:
+        closed = asyncio.Event()
+        try:
+            dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+            connection = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("%s cache listener could not connect: %s", label, e)
+            await asyncio.sleep(retry_seconds)
+            continue
+        try:
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(
+                channel, lambda _conn, _pid, _channel, payload: cache.invalidate(key(payload))
+            )
+            cache.clear()
+            await closed.wait()
+            logger.warning("%s cache listener connection lost; reconnecting", label)
+        finally:
+            if not connection.is_closed():
+                await connection.close()
@@ -13,6 +13,16 @@ class Settings:
 
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds; replace older connections
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0 disables
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"  # log every statement
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+    DB_SLOW_QUERY_SAMPLE_RATE: float = float(os.getenv("DB_SLOW_QUERY_SAMPLE_RATE", "1.0"))
 
     # Application
     SECRET_KEY: str = os.getenv("SECRET_KEY")
@@ -26,5 +36,48 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing (pbkdf2_sha256); hashes with fewer rounds are upgraded on login
+    PASSWORD_HASH_ROUNDS: int = int(os.getenv("PASSWORD_HASH_ROUNDS", "30000"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))  # pending hashes before 503
+
+    # Invoice PDFs
+    PDF_CACHE_DIR: str = os.getenv("PDF_CACHE_DIR", ".cache/invoice-pdf")
+    PDF_RENDER_WORKERS: int = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+    # Eviction (0 disables a cap): least recently served PDFs go first once the
+    # cache is over PDF_CACHE_MAX_MB; PDFs not served for PDF_CACHE_MAX_AGE_DAYS go
+    # regardless. Swept after a render at most every PDF_CACHE_SWEEP_INTERVAL seconds.
+    PDF_CACHE_MAX_MB: float = float(os.getenv("PDF_CACHE_MAX_MB", "512"))
+    PDF_CACHE_MAX_AGE_DAYS: float = float(os.getenv("PDF_CACHE_MAX_AGE_DAYS", "30"))
+    PDF_CACHE_SWEEP_INTERVAL: float = float(os.getenv("PDF_CACHE_SWEEP_INTERVAL", "300"))
+
+    # Authenticated-user cache (seconds; 0 disables caching). USER_CACHE_NOTIFY
+    # propagates invalidations to all workers via Postgres LISTEN/NOTIFY.
+    USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_NOTIFY: bool = os.getenv("USER_CACHE_NOTIFY", "false").lower() == "true"
+
+    # Dashboard stats cache (seconds; 0 disables caching). Writes invalidate the
+    # writing worker's entry at once; other workers serve counts up to
+    # DASHBOARD_CACHE_TTL old unless DASHBOARD_CACHE_NOTIFY is on, which drops
+    # their entries via Postgres LISTEN/NOTIFY when the write commits.
+    DASHBOARD_CACHE_TTL: float = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+    DASHBOARD_CACHE_SIZE: int = int(os.getenv("DASHBOARD_CACHE_SIZE", "10000"))
+    DASHBOARD_CACHE_NOTIFY: bool = os.getenv("DASHBOARD_CACHE_NOTIFY", "false").lower() == "true"
+
+
+    # Per-request instrumentation: Server-Timing header and budgets (0 disables a budget).
+    # Routes may override the budgets with app.core.instrumentation.request_budget;
+    # REQUEST_BUDGET_STRICT turns a violation into an error (for tests).
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    REQUEST_QUERY_BUDGET: int = int(os.getenv("REQUEST_QUERY_BUDGET", "20"))
+    REQUEST_TIME_BUDGET_MS: float = float(os.getenv("REQUEST_TIME_BUDGET_MS", "1000"))
+    REQUEST_BUDGET_STRICT: bool = os.getenv("REQUEST_BUDGET_STRICT", "false").lower() == "true"
+
+
+    # Prometheus /metrics. With several workers also set PROMETHEUS_MULTIPROC_DIR
+    # (read by prometheus_client) to a directory emptied on every server start.
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
 
 settings = Settings()
\ No newline at end of file
@@ -1,13 +1,195 @@
+import logging
+import random
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.core.instrumentation import record_query
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKOUT_WAIT, DB_POOL_SIZE
+)
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+# Same database through the asyncpg driver, used by the API
+ASYNC_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+
+class PoolMetrics:
+    """
+    Connection checkout counters for one engine's pool. The counters describe
+    this process; the Prometheus series (labelled by engine) cover all workers.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+
+    def observe(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.checkout_wait_seconds_total += wait_seconds
+            self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, wait_seconds)
+        if timed_out:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(self.name).inc()
+        else:
+            DB_POOL_CHECKOUT_WAIT.labels(self.name).observe(wait_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_seconds_total": self.checkout_wait_seconds_total,
+                "checkout_wait_seconds_max": self.checkout_wait_seconds_max,
+            }
+
+
+def _instrumented_pool(pool_class, metrics: PoolMetrics):
+    """Subclass of `pool_class` that times every connection checkout, including waits for a free slot."""
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.observe(time.perf_counter() - start, timed_out=True)
+                raise
+            metrics.observe(time.perf_counter() - start)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def _install_slow_query_logger(sync_engine: Engine) -> None:
+    """
+    Log a sample of statements slower than DB_SLOW_QUERY_MS (replaces blanket
+    echo) and charge every statement to the current request's stats.
+    """
+    threshold = settings.DB_SLOW_QUERY_MS / 1000
+    sample_rate = settings.DB_SLOW_QUERY_SAMPLE_RATE
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started_at
+        record_query(elapsed)
+        if elapsed >= threshold and random.random() < sample_rate:
+            slow_query_logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+
+
+def _install_pool_gauges(sync_engine: Engine, name: str) -> None:
+    """Keep the cross-process pool size and checked-out gauges current."""
+    DB_POOL_SIZE.labels(name).set(settings.DB_POOL_SIZE)
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def _pool_options(pool_class, metrics: PoolMetrics) -> dict:
+    return {
+        "poolclass": _instrumented_pool(pool_class, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+    }
+
+
+def create_db_engine():
+    """Sync (psycopg2) engine configured from Settings."""
+    metrics = PoolMetrics("sync")
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    db_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args=connect_args,
+        **_pool_options(QueuePool, metrics)
+    )
+    db_engine.pool_metrics = metrics
+    _install_slow_query_logger(db_engine)
+    _install_pool_gauges(db_engine, metrics.name)
+    return db_engine
+
+
+def create_async_db_engine():
+    """
+    Async (asyncpg) engine configured from Settings. asyncpg runs statements
+    as server-side prepared statements, cached per connection; set
+    DB_PREPARED_STATEMENT_CACHE_SIZE=0 behind a transaction-mode pgbouncer.
+    """
+    metrics = PoolMetrics("async")
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    db_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args=connect_args,
+        **_pool_options(AsyncAdaptedQueuePool, metrics)
+    )
+    db_engine.sync_engine.pool_metrics = metrics
+    _install_slow_query_logger(db_engine.sync_engine)
+    _install_pool_gauges(db_engine.sync_engine, metrics.name)
+    return db_engine
+
+
+# Sync engine: CLI, migrations, benchmarks and scripts
+engine = create_db_engine()
+
+# Async engine: request handlers wait on the database without holding a threadpool worker
+async_engine = create_async_db_engine()
+
+
+def pool_stats(sync_engine: Engine) -> dict:
+    """Current pool occupancy plus cumulative checkout/wait counters for an engine."""
+    pool = sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        **sync_engine.pool_metrics.snapshot(),
+    }
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 def get_session():
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session():
+    """
+    Request-scoped AsyncSession. Services are plain functions taking a Session;
+    call them with `await db.run_sync(service, ...)`, which runs them against
+    this session with every query awaited on the event loop.
+    """
+    async with AsyncSession(async_engine) as session:
+        yield session
@@ -0,0 +1,45 @@
+import hashlib
+from fastapi import Request, Response
+
+# Clients may store responses but must revalidate them with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(*parts) -> str:
+    """Weak ETag derived from watermark values (data versions, updated_at) rather than the payload."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def query_key(request: Request) -> tuple:
+    """
+    The request's query parameters in canonical (sorted) order, so list ETags
+    differ per page, filter and view but not per parameter order.
+    """
+    return tuple(sorted(request.query_params.multi_items()))
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match matches `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [_opaque(tag) for tag in header.split(",")]
+    return "*" in tags or _opaque(etag) in tags
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current validators."""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
@@ -0,0 +1,145 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from app.core.config import settings
+
+budget_logger = logging.getLogger("app.request.budget")
+
+
+class RequestStats:
+    """Statements issued and database time spent while serving one request."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class RequestBudgetExceeded(Exception):
+    """Raised after the response when REQUEST_BUDGET_STRICT is set and a budget is exceeded."""
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+# Full path templates (router prefix + route path) by id() of the route object
+_route_templates: Dict[int, str] = {}
+
+
+def record_query(elapsed: float) -> None:
+    """Charge one statement to the request being served, if any (called from engine events)."""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def request_budget(max_queries: Optional[int] = None, max_ms: Optional[float] = None):
+    """
+    Per-route budget, overriding REQUEST_QUERY_BUDGET / REQUEST_TIME_BUDGET_MS.
+    Apply it below the route decorator so the registered endpoint carries it.
+    """
+    def decorator(endpoint):
+        endpoint.request_budget = (max_queries, max_ms)
+        return endpoint
+    return decorator
+
+
+def register_route_templates(router, prefix: str) -> None:
+    """Remember the full path template of every route of a router included under `prefix`."""
+    for route in router.routes:
+        _route_templates[id(route)] = prefix + route.path
+
+
+def route_template(scope) -> Optional[str]:
+    """Path template of the route that served a request (e.g. /api/v1/invoices/{invoice_id}), if matched."""
+    route = scope.get("route")
+    if route is None:
+        return None
+    return _route_templates.get(id(route), getattr(route, "path", None))
+
+
+def _route_budget(scope) -> tuple:
+    route = scope.get("route")
+    budget = getattr(getattr(route, "endpoint", None), "request_budget", (None, None))
+    max_queries, max_ms = budget
+    if max_queries is None:
+        max_queries = settings.REQUEST_QUERY_BUDGET
+    if max_ms is None:
+        max_ms = settings.REQUEST_TIME_BUDGET_MS
+    return max_queries, max_ms
+
+
+def _server_timing(stats: RequestStats, elapsed: float) -> bytes:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"app;dur={elapsed * 1000:.1f}"
+    ).encode()
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Counts statements and database time per request, reports them in a
+    Server-Timing header and logs a structured warning when the route's
+    query-count or latency budget is exceeded (0 disables a budget).
+
+    Statements issued while a streaming body is sent are counted towards the
+    budget but are not in the header, which has already gone out.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - start)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+        self._check_budget(scope, stats, time.perf_counter() - start)
+
+    def _check_budget(self, scope, stats: RequestStats, elapsed: float) -> None:
+        max_queries, max_ms = _route_budget(scope)
+        elapsed_ms = elapsed * 1000
+        exceeded = []
+        if max_queries and stats.queries > max_queries:
+            exceeded.append("queries")
+        if max_ms and elapsed_ms > max_ms:
+            exceeded.append("latency")
+        if not exceeded:
+            return
+
+        route = scope.get("route")
+        details = {
+            "method": scope["method"],
+            "route": route_template(scope) or scope["path"],
+            "endpoint": getattr(getattr(route, "endpoint", None), "__name__", None),
+            "exceeded": ",".join(exceeded),
+            "queries": stats.queries,
+            "max_queries": max_queries,
+            "db_ms": round(stats.db_seconds * 1000, 1),
+            "elapsed_ms": round(elapsed_ms, 1),
+            "max_ms": max_ms,
+        }
+        budget_logger.warning(
+            "Request budget exceeded: %s",
+            " ".join(f"{key}={value}" for key, value in details.items()),
+            extra={"request_budget": details}
+        )
+        if settings.REQUEST_BUDGET_STRICT:
+            raise RequestBudgetExceeded(details)
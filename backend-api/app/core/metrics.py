@@ -0,0 +1,113 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+
+# With PROMETHEUS_MULTIPROC_DIR set (several uvicorn/gunicorn workers), every
+# process writes its samples to that directory and /metrics aggregates them,
+# whichever worker serves the scrape. The directory must be emptied when the
+# server starts. Gauges use "livesum" so values from dead workers drop out.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being served",
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool size (excluding overflow)",
+    ["engine"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pool connection",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["engine"]
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "In-process cache lookups; hit ratio = hit / (hit + miss)",
+    ["cache", "result"]
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hashes queued or running on the hashing executor",
+    multiprocess_mode="livesum"
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "Hashing jobs rejected because PASSWORD_HASH_MAX_QUEUE was reached"
+)
+
+
+def render_metrics() -> tuple:
+    """(body, content type) of the exposition for all workers."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory (call on shutdown)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    Records latency per route template and in-flight requests. Unmatched
+    paths are labelled "unmatched" so 404 scans cannot explode the label set.
+    """
+
+    def __init__(self, app, route_template):
+        self.app = app
+        self.route_template = route_template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            REQUEST_LATENCY.labels(
+                scope["method"], self.route_template(scope) or "unmatched", str(status)
+            ).observe(time.perf_counter() - start)
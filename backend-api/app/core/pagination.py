@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from sqlalchemy import tuple_
+
+# Keyset position: (created_at, id) of the last row on the previous page
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor string."""
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def paginate(query, model, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None):
+    """
+    Apply a stable (created_at, id) ordering and either keyset or offset pagination.
+    When `after` is given the query seeks past that position and `skip` is ignored,
+    so the cost of a page does not depend on how deep it is.
+    """
+    query = query.order_by(model.created_at, model.id)
+    if after is not None:
+        query = query.where(tuple_(model.created_at, model.id) > tuple_(*after))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -1,10 +1,31 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Any, Union
+from typing import Optional, Any, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_QUEUE_DEPTH, PASSWORD_HASH_REJECTED
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The one password hashing policy. Hashes made with another scheme or with
+# fewer rounds still verify, and are replaced on the next successful login.
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256", "bcrypt"],
+    deprecated=["bcrypt"],
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+
+class HashingQueueFull(Exception):
+    """Raised when PASSWORD_HASH_MAX_QUEUE hashing jobs are already pending."""
+
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_lock = threading.Lock()
+_hash_queue_depth = 0
+_hash_rejected = 0
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
@@ -21,3 +42,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Threads dedicated to hashing (hashlib's PBKDF2 releases the GIL), created on first use."""
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+        return _hash_executor
+
+async def _run_hashing(fn, *args):
+    """
+    Run a hashing call on the dedicated executor, so neither the event loop
+    nor the shared threadpool does the CPU work. At most
+    PASSWORD_HASH_MAX_QUEUE calls may be pending; beyond that the call is
+    rejected with HashingQueueFull instead of queueing without bound.
+    """
+    global _hash_queue_depth, _hash_rejected
+    with _hash_lock:
+        if _hash_queue_depth >= settings.PASSWORD_HASH_MAX_QUEUE:
+            _hash_rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise HashingQueueFull()
+        _hash_queue_depth += 1
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        with _hash_lock:
+            _hash_queue_depth -= 1
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password off the event loop.
+    Returns (valid, new_hash); new_hash is set when the stored hash uses a
+    legacy scheme or too few rounds and should be replaced.
+    """
+    return await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop."""
+    return await _run_hashing(pwd_context.hash, password)
+
+def hashing_stats() -> dict:
+    """Hashing executor size, pending jobs (queued or running) and rejected jobs."""
+    with _hash_lock:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+            "queue_depth": _hash_queue_depth,
+            "rejected": _hash_rejected,
+        }
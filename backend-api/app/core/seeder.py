@@ -1,8 +1,18 @@
-from sqlmodel import Session
-from app.models.user import UserCreate
+import io
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+from sqlmodel import Session, func, select
+from app.core.database import engine
+from app.core.security import get_password_hash
+from app.models.user import User, UserCreate
+from app.models.invoice import InvoiceItem
 from app.models.client import ClientCreate
 from app.services.user import create_user, get_user_by_email
 from app.services.client import create_client
+from app.services.rollup import rebuild_rollups
 
 def seed_users(session: Session):
     """Seed the database with test users."""
@@ -109,3 +119,242 @@ def seed_clients(session: Session):
 
     print(f"Total clients created: {created_count}")
     return created_count
+
+
+# === BULK SEEDING (cli.py seed --scale N) ===
+# Per unit of scale; tenant sizes are skewed (a few large tenants, a long tail)
+SCALE_USERS = 10
+SCALE_CLIENTS = 500
+SCALE_PRODUCTS = 100
+SCALE_INVOICES = 10_000
+BULK_PASSWORD = "password"
+INVOICE_CHUNK = 50_000  # Invoices per worker task
+COPY_BATCH = 20_000  # Rows buffered per COPY
+
+STATUS_WEIGHTS = (("draft", 10), ("sent", 25), ("paid", 60), ("cancelled", 5))
+CURRENCY_WEIGHTS = (("USD", 70), ("EUR", 20), ("GBP", 10))
+ITEM_COUNT_WEIGHTS = (1, 2, 3, 4, 5, 6), (20, 30, 25, 12, 8, 5)  # ~2.8 items per invoice
+PAYMENT_TERMS_DAYS = (14, 30, 30, 30, 45, 60)
+HISTORY_DAYS = 730
+
+
+def _split(total: int, weights: List[float], minimum: int = 0) -> List[int]:
+    """Split `total` proportionally to `weights` (largest remainder), each share at least `minimum`."""
+    scale = sum(weights)
+    shares = [max(minimum, int(total * weight / scale)) for weight in weights]
+    remainder = total - sum(shares)
+    for index in range(max(0, remainder)):
+        shares[index % len(shares)] += 1
+    return shares
+
+
+def _product_price(product_id: int) -> float:
+    """Deterministic list price of a seeded product, so workers need not look it up."""
+    return round(5 + (product_id * 7919 % 99500) / 100, 2)
+
+
+def _reserve_ids(db: Session, table: str, count: int) -> int:
+    """Claim `count` consecutive ids from a table's sequence and return the first."""
+    last = db.connection().exec_driver_sql(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"nextval(pg_get_serial_sequence('{table}', 'id')) + {count - 1})"
+    ).scalar()
+    return last - count + 1
+
+
+def _copy_rows(cursor, table: str, columns: Tuple[str, ...], rows) -> int:
+    """COPY rows (tuples; None is NULL) into `table` in bounded batches. Returns the row count."""
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buffer, buffered, total = io.StringIO(), 0, 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        buffer.write("\t".join("\\N" if value is None else str(value) for value in row))
+        buffer.write("\n")
+        buffered += 1
+        if buffered == COPY_BATCH:
+            flush()
+            total += buffered
+            buffered = 0
+    if buffered:
+        flush()
+        total += buffered
+    return total
+
+
+def _with_raw_connection(work: Callable) -> int:
+    """Run `work(cursor)` on a raw psycopg2 connection in one transaction."""
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            count = work(cursor)
+        connection.commit()
+        return count
+    finally:
+        connection.close()
+
+
+def _seed_catalog_task(tenants: List[tuple], now: datetime, seed: int) -> int:
+    """Worker: COPY the clients and products of some tenants (ids already reserved)."""
+    def work(cursor):
+        rng = random.Random(seed)
+        clients, products = [], []
+        for user_id, first_client, client_count, first_product, product_count in tenants:
+            for offset in range(client_count):
+                client_id = first_client + offset
+                created_at = now - timedelta(days=rng.random() * HISTORY_DAYS)
+                clients.append((
+                    client_id, f"Client {client_id} Ltd", f"billing{client_id}@client{user_id}.example.com",
+                    f"{rng.randint(1, 999)} Market Street" if rng.random() < 0.8 else None,
+                    created_at, created_at, user_id
+                ))
+            for offset in range(product_count):
+                product_id = first_product + offset
+                created_at = now - timedelta(days=rng.random() * HISTORY_DAYS)
+                products.append((
+                    product_id, f"Product {product_id}", None, _product_price(product_id), "USD",
+                    created_at, created_at, user_id
+                ))
+        count = _copy_rows(cursor, "clients", ("id", "name", "email", "address", "created_at", "updated_at", "user_id"), clients)
+        count += _copy_rows(cursor, "products", ("id", "name", "description", "price", "currency", "created_at", "updated_at", "user_id"), products)
+        return count
+    return _with_raw_connection(work)
+
+
+def _seed_invoice_task(task: tuple, now: datetime, seed: int) -> int:
+    """Worker: COPY one chunk of a tenant's invoices and their items."""
+    user_id, first_invoice, invoice_count, first_client, client_count, first_product, product_count, task_seed = task
+    rng = random.Random(seed * 1_000_003 + task_seed)
+    statuses, status_weights = zip(*STATUS_WEIGHTS)
+    currencies, currency_weights = zip(*CURRENCY_WEIGHTS)
+    tenant_currency = random.Random(user_id).choices(currencies, currency_weights)[0]
+    # A fifth of the catalogue accounts for most sales
+    popular_products = max(1, product_count // 5)
+
+    def work(cursor):
+        invoices, items = [], []
+        for offset in range(invoice_count):
+            invoice_id = first_invoice + offset
+            # Skewed towards recent dates: activity grows over time
+            created_at = now - timedelta(days=HISTORY_DAYS * rng.random() ** 1.5, seconds=rng.randint(0, 86399))
+            total = 0.0
+            for _ in range(rng.choices(*ITEM_COUNT_WEIGHTS)[0]):
+                if rng.random() < 0.8:
+                    product_id = first_product + rng.randrange(popular_products)
+                else:
+                    product_id = first_product + rng.randrange(product_count)
+                quantity = min(rng.randint(1, 3), rng.randint(1, 20))
+                unit_price = _product_price(product_id)
+                total += quantity * unit_price
+                items.append((invoice_id, product_id, quantity, unit_price))
+            invoices.append((
+                invoice_id,
+                first_client + min(int(rng.expovariate(5 / client_count)), client_count - 1),
+                user_id,
+                rng.choices(statuses, status_weights)[0],
+                created_at + timedelta(days=rng.choice(PAYMENT_TERMS_DAYS)),
+                round(total, 2),
+                tenant_currency if rng.random() < 0.95 else rng.choice(currencies),
+                False,
+                created_at,
+                created_at,
+            ))
+        count = _copy_rows(cursor, "invoices", (
+            "id", "client_id", "user_id", "status", "due_date", "total_amount", "currency",
+            "is_recurring", "created_at", "updated_at"
+        ), invoices)
+        _copy_rows(cursor, "invoice_items", ("invoice_id", "product_id", "quantity", "unit_price"), items)
+        return count
+    return _with_raw_connection(work)
+
+
+def seed_bulk(session: Session, scale: int, workers: int, seed: int = 42,
+              progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Seed `scale` units of realistic data (SCALE_* rows per unit) with COPY from
+    `workers` processes. Users share one precomputed password hash. Tenant
+    sizes follow a Zipf-like skew; invoices get a status mix, a date spread
+    over HISTORY_DAYS weighted towards recent activity, and 1-6 items.
+    Returns the number of rows created per table.
+    """
+    progress = progress or (lambda message: None)
+    prefix = f"seed{seed}-"
+    if session.exec(select(func.count()).select_from(User).where(User.email.startswith(prefix))).one():
+        raise ValueError(f"Users with the {prefix}* prefix already exist; pick another --seed")
+
+    user_count = SCALE_USERS * scale
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(user_count)]
+    client_counts = _split(SCALE_CLIENTS * scale, weights, minimum=1)
+    product_counts = _split(SCALE_PRODUCTS * scale, weights, minimum=1)
+    invoice_counts = _split(SCALE_INVOICES * scale, weights)
+    now = datetime.utcnow()
+
+    # Users: one hash for everyone, one COPY
+    hashed_password = get_password_hash(BULK_PASSWORD)
+    first_user = _reserve_ids(session, "users", user_count)
+    first_client = _reserve_ids(session, "clients", sum(client_counts))
+    first_product = _reserve_ids(session, "products", sum(product_counts))
+    first_invoice = _reserve_ids(session, "invoices", sum(invoice_counts))
+    session.commit()
+    _with_raw_connection(lambda cursor: _copy_rows(
+        cursor, "users", ("id", "email", "full_name", "hashed_password", "is_active", "created_at", "updated_at"),
+        (
+            (first_user + n, f"{prefix}tenant{n}@example.com", f"Tenant {n}", hashed_password, True, now, now)
+            for n in range(user_count)
+        )
+    ))
+    progress(f"{user_count} users")
+
+    # Id ranges per tenant
+    tenants, invoice_tasks = [], []
+    client_id, product_id, invoice_id = first_client, first_product, first_invoice
+    for n in range(user_count):
+        user_id = first_user + n
+        tenants.append((user_id, client_id, client_counts[n], product_id, product_counts[n]))
+        for start in range(0, invoice_counts[n], INVOICE_CHUNK):
+            chunk = min(INVOICE_CHUNK, invoice_counts[n] - start)
+            invoice_tasks.append((
+                user_id, invoice_id + start, chunk, client_id, client_counts[n], product_id, product_counts[n],
+                len(invoice_tasks)
+            ))
+        client_id += client_counts[n]
+        product_id += product_counts[n]
+        invoice_id += invoice_counts[n]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Clients and products must exist before any invoice references them
+        groups = [tenants[index::workers] for index in range(workers)]
+        list(pool.map(_seed_catalog_task, groups, [now] * workers, [seed + index for index in range(workers)]))
+        progress(f"{sum(client_counts)} clients, {sum(product_counts)} products")
+
+        # Largest chunks first so the pool drains evenly
+        invoice_tasks.sort(key=lambda task: -task[2])
+        done, reported, total = 0, 0, sum(invoice_counts)
+        for count in pool.map(_seed_invoice_task, invoice_tasks, [now] * len(invoice_tasks), [seed] * len(invoice_tasks)):
+            done += count
+            if done * 10 // total > reported or done == total:
+                reported = done * 10 // total
+                progress(f"{done}/{total} invoices")
+
+    for n in range(user_count):
+        if invoice_counts[n]:
+            rebuild_rollups(session, user_id=first_user + n)
+    session.connection().exec_driver_sql("ANALYZE users, clients, products, invoices, invoice_items, invoice_daily_rollup")
+    session.commit()
+
+    item_count = session.exec(
+        select(func.count()).select_from(InvoiceItem)
+        .where(InvoiceItem.invoice_id.between(first_invoice, first_invoice + sum(invoice_counts) - 1))
+    ).one()
+    return {
+        "users": user_count,
+        "clients": sum(client_counts),
+        "products": sum(product_counts),
+        "invoices": sum(invoice_counts),
+        "invoice_items": item_count,
+    }
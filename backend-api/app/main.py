@@ -1,12 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import users, auth, clients, products, invoices, stats
+from app.core.instrumentation import RequestInstrumentationMiddleware, register_route_templates, route_template
+from app.core.metrics import MetricsMiddleware, mark_process_dead
+from app.services.pdf import shutdown_render_pool
+from app.services.stats import listen_for_dashboard_changes
+from app.services.user import listen_for_user_changes
+from app.api import metrics
+from app.api.v1 import users, auth, clients, products, invoices, stats, reports
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep this worker's caches in sync with writes made by other workers
+    listeners = []
+    if settings.USER_CACHE_NOTIFY:
+        listeners.append(asyncio.create_task(listen_for_user_changes()))
+    if settings.DASHBOARD_CACHE_NOTIFY:
+        listeners.append(asyncio.create_task(listen_for_dashboard_changes()))
+    yield
+    for listener in listeners:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    shutdown_render_pool()
+    mark_process_dead()
 
 app = FastAPI(
     title=settings.APP_TITLE,
     description=settings.APP_DESCRIPTION,
-    version=settings.APP_VERSION
+    version=settings.APP_VERSION,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -18,10 +43,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Query count, DB time and latency budgets per request
+app.add_middleware(RequestInstrumentationMiddleware)
+
 # Include routers
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
-app.include_router(clients.router, prefix="/api/v1/clients", tags=["Clients"])
-app.include_router(products.router, prefix="/api/v1/products", tags=["Products"])
-app.include_router(invoices.router, prefix="/api/v1/invoices", tags=["Invoices"])
-app.include_router(stats.router, prefix="/api/v1/stats", tags=["Stats"])
\ No newline at end of file
+ROUTERS = [
+    (auth.router, "/api/v1/auth", "Auth"),
+    (users.router, "/api/v1/users", "Users"),
+    (clients.router, "/api/v1/clients", "Clients"),
+    (products.router, "/api/v1/products", "Products"),
+    (invoices.router, "/api/v1/invoices", "Invoices"),
+    (stats.router, "/api/v1/stats", "Stats"),
+    (reports.router, "/api/v1/reports", "Reports"),
+]
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+    register_route_templates(router, prefix)
+
+# Prometheus metrics; added last so it is the outermost middleware and times everything
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["Metrics"])
+    app.add_middleware(MetricsMiddleware, route_template=route_template)
@@ -0,0 +1,46 @@
+"""notify_tenant_data_changes
+
+Revision ID: 3b7e5f0a9c12
+Revises: d91f4a6c2b73
+Create Date: 2026-10-18 22:14:07.918362
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e5f0a9c12'
+down_revision = 'd91f4a6c2b73'
+branch_labels = None
+depends_on = None
+
+FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_tenant_data_version() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO tenant_data_versions (user_id, version)
+            SELECT DISTINCT user_id, 1 FROM old_rows ORDER BY user_id
+            ON CONFLICT (user_id) DO UPDATE SET version = tenant_data_versions.version + 1;
+            {notify_old}
+        ELSE
+            INSERT INTO tenant_data_versions (user_id, version)
+            SELECT DISTINCT user_id, 1 FROM new_rows ORDER BY user_id
+            ON CONFLICT (user_id) DO UPDATE SET version = tenant_data_versions.version + 1;
+            {notify_new}
+        END IF;
+        RETURN NULL;
+    END $$
+"""
+
+NOTIFY = ("PERFORM pg_notify('tenant_data_changed', user_id::text) "
+          "FROM (SELECT DISTINCT user_id FROM {rows}) AS changed;")
+
+
+def upgrade() -> None:
+    # Also tell listening workers whose data changed (delivered on commit)
+    op.execute(FUNCTION.format(notify_old=NOTIFY.format(rows='old_rows'), notify_new=NOTIFY.format(rows='new_rows')))
+
+
+def downgrade() -> None:
+    op.execute(FUNCTION.format(notify_old='', notify_new=''))
@@ -0,0 +1,30 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 5c1e8a9d2f47
+Revises: 10b2e2dd2870
+Create Date: 2026-10-18 09:12:44.301582
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e8a9d2f47'
+down_revision = '10b2e2dd2870'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset pagination seeks on (created_at, id) within a user's rows
+    op.create_index('ix_invoices_user_id_created_at_id', 'invoices', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_clients_user_id_created_at_id', 'clients', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_products_user_id_created_at_id', 'products', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_products_user_id_created_at_id', table_name='products')
+    op.drop_index('ix_clients_user_id_created_at_id', table_name='clients')
+    op.drop_index('ix_invoices_user_id_created_at_id', table_name='invoices')
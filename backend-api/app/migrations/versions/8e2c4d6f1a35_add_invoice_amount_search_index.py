@@ -0,0 +1,31 @@
+"""add_invoice_amount_search_index
+
+Revision ID: 8e2c4d6f1a35
+Revises: 3b7e5f0a9c12
+Create Date: 2026-10-19 09:12:33.402871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2c4d6f1a35'
+down_revision = '3b7e5f0a9c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Amount searches match total_amount to the cent; CONCURRENTLY avoids
+    # locking invoice writes while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index('ix_invoices_user_id_amount', 'invoices',
+                        ['user_id', sa.text('round(CAST(total_amount AS NUMERIC), 2)')],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_invoices_user_id_amount', table_name='invoices',
+                      postgresql_concurrently=True, if_exists=True)
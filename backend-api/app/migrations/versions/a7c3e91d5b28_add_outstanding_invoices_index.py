@@ -0,0 +1,36 @@
+"""add_outstanding_invoices_index
+
+Revision ID: a7c3e91d5b28
+Revises: f2d6b8a0c394
+Create Date: 2026-10-18 17:05:41.602318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91d5b28'
+down_revision = 'f2d6b8a0c394'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers the aging report (user, client, due date, amount, currency of
+    # 'sent' invoices) so it never visits the invoices heap
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_invoices_user_id_outstanding', 'invoices', ['user_id', 'client_id', 'due_date'],
+            unique=False,
+            postgresql_include=['total_amount', 'currency'],
+            postgresql_where=sa.text("status = 'sent'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_invoices_user_id_outstanding', table_name='invoices',
+                      postgresql_concurrently=True, if_exists=True)
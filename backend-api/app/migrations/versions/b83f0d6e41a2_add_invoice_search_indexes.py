@@ -0,0 +1,31 @@
+"""add_invoice_search_indexes
+
+Revision ID: b83f0d6e41a2
+Revises: 5c1e8a9d2f47
+Create Date: 2026-10-18 11:40:27.918305
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83f0d6e41a2'
+down_revision = '5c1e8a9d2f47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trigram GIN indexes make ILIKE '%term%' on client name/email index-backed
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_clients_name_trgm', 'clients', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_clients_email_trgm', 'clients', ['email'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+    op.create_index('ix_invoices_user_id_client_id', 'invoices', ['user_id', 'client_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_user_id_client_id', table_name='invoices')
+    op.drop_index('ix_clients_email_trgm', table_name='clients')
+    op.drop_index('ix_clients_name_trgm', table_name='clients')
@@ -0,0 +1,42 @@
+"""add_invoice_daily_rollup
+
+Revision ID: c58d2f17a94e
+Revises: a7c3e91d5b28
+Create Date: 2026-10-18 17:48:12.337905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58d2f17a94e'
+down_revision = 'a7c3e91d5b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('invoice_daily_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False),
+    sa.Column('invoice_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'status', 'currency')
+    )
+
+    # Backfill from existing invoices
+    op.execute("""
+        INSERT INTO invoice_daily_rollup (user_id, day, status, currency, invoice_count, total_amount)
+        SELECT user_id, CAST(created_at AS DATE), status, currency, count(*), sum(total_amount)
+        FROM invoices
+        GROUP BY user_id, CAST(created_at AS DATE), status, currency
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('invoice_daily_rollup')
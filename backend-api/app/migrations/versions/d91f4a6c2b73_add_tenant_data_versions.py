@@ -0,0 +1,60 @@
+"""add_tenant_data_versions
+
+Revision ID: d91f4a6c2b73
+Revises: c58d2f17a94e
+Create Date: 2026-10-18 21:05:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91f4a6c2b73'
+down_revision = 'c58d2f17a94e'
+branch_labels = None
+depends_on = None
+
+TABLES = ('clients', 'products', 'invoices')
+EVENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def upgrade() -> None:
+    op.create_table('tenant_data_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_tenant_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO tenant_data_versions (user_id, version)
+                SELECT DISTINCT user_id, 1 FROM old_rows ORDER BY user_id
+                ON CONFLICT (user_id) DO UPDATE SET version = tenant_data_versions.version + 1;
+            ELSE
+                INSERT INTO tenant_data_versions (user_id, version)
+                SELECT DISTINCT user_id, 1 FROM new_rows ORDER BY user_id
+                ON CONFLICT (user_id) DO UPDATE SET version = tenant_data_versions.version + 1;
+            END IF;
+            RETURN NULL;
+        END $$
+    """)
+    for table in TABLES:
+        for event in EVENTS:
+            rows = 'OLD TABLE AS old_rows' if event == 'DELETE' else 'NEW TABLE AS new_rows'
+            op.execute(
+                f"CREATE TRIGGER {table}_bump_version_{event.lower()} AFTER {event} ON {table} "
+                f"REFERENCING {rows} FOR EACH STATEMENT EXECUTE FUNCTION bump_tenant_data_version()"
+            )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        for event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version_{event.lower()} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_tenant_data_version()")
+    op.drop_table('tenant_data_versions')
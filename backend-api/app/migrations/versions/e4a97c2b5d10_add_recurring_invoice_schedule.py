@@ -0,0 +1,72 @@
+"""add_recurring_invoice_schedule
+
+Revision ID: e4a97c2b5d10
+Revises: b83f0d6e41a2
+Create Date: 2026-10-18 14:05:51.662310
+
+"""
+import calendar
+from datetime import datetime, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a97c2b5d10'
+down_revision = 'b83f0d6e41a2'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the schedule rules at this revision; migrations must not
+# import app code, which may change after the migration is written
+MONTH_INTERVALS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+DAY_INTERVALS = {"daily": 1, "weekly": 7}
+
+
+def next_run_after(start, interval):
+    """`start` advanced by one interval (months clamp to the month's last day), or None."""
+    if interval in DAY_INTERVALS:
+        return start + timedelta(days=DAY_INTERVALS[interval])
+    if interval in MONTH_INTERVALS:
+        month_index = start.month - 1 + MONTH_INTERVALS[interval]
+        year = start.year + month_index // 12
+        month = month_index % 12 + 1
+        day = min(start.day, calendar.monthrange(year, month)[1])
+        return start.replace(year=year, month=month, day=day)
+    return None
+
+
+def upgrade() -> None:
+    op.add_column('invoices', sa.Column('next_run_at', sa.DateTime(), nullable=True))
+    op.add_column('invoices', sa.Column('recurring_source_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('invoices_recurring_source_id_fkey', 'invoices', 'invoices',
+                          ['recurring_source_id'], ['id'], ondelete='SET NULL')
+    op.create_index('ix_invoices_next_run_at', 'invoices', ['next_run_at'], unique=False,
+                    postgresql_where=sa.text('next_run_at IS NOT NULL'))
+    op.create_index('ux_invoices_recurring_source_id_due_date', 'invoices',
+                    ['recurring_source_id', 'due_date'], unique=True)
+
+    # Schedule existing recurring invoices from their next occurrence after
+    # now, so the first run does not back-fill occurrences created externally
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    rows = bind.execute(sa.text(
+        "SELECT id, created_at, recurring_interval FROM invoices WHERE is_recurring"
+    )).all()
+    for invoice_id, created_at, interval in rows:
+        next_run_at = next_run_after(created_at, interval)
+        while next_run_at is not None and next_run_at <= now:
+            next_run_at = next_run_after(next_run_at, interval)
+        if next_run_at is not None:
+            bind.execute(
+                sa.text("UPDATE invoices SET next_run_at = :next_run_at WHERE id = :id"),
+                {"next_run_at": next_run_at, "id": invoice_id}
+            )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_invoices_recurring_source_id_due_date', table_name='invoices')
+    op.drop_index('ix_invoices_next_run_at', table_name='invoices')
+    op.drop_constraint('invoices_recurring_source_id_fkey', 'invoices', type_='foreignkey')
+    op.drop_column('invoices', 'recurring_source_id')
+    op.drop_column('invoices', 'next_run_at')
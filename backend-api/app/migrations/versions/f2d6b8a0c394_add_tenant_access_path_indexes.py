@@ -0,0 +1,42 @@
+"""add_tenant_access_path_indexes
+
+Revision ID: f2d6b8a0c394
+Revises: e4a97c2b5d10
+Create Date: 2026-10-18 16:22:09.184470
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d6b8a0c394'
+down_revision = 'e4a97c2b5d10'
+branch_labels = None
+depends_on = None
+
+# clients(user_id) and products(user_id) are already served by the
+# (user_id, created_at, id) keyset indexes, so they are not duplicated here.
+INDEXES = [
+    # Status-filtered invoice lists and per-status counts
+    ('ix_invoices_user_id_status_created_at_id', 'invoices', ['user_id', 'status', 'created_at', 'id']),
+    # Loading/deleting an invoice's items
+    ('ix_invoice_items_invoice_id', 'invoice_items', ['invoice_id']),
+    # Foreign key checks when deleting clients and products
+    ('ix_invoices_client_id', 'invoices', ['client_id']),
+    ('ix_invoice_items_product_id', 'invoice_items', ['product_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction, but avoids locking
+    # writes on large tables while the index builds
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional
 from datetime import datetime
@@ -11,6 +12,13 @@ class ClientFiltersMeta(BaseModel):
 
 class Client(SQLModel, table=True):
     __tablename__ = "clients"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_clients_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Trigram indexes for substring (ILIKE '%term%') search
+        Index("ix_clients_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_clients_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
 
     id: int = Field(default=None, primary_key=True)
     name: str = Field(index=True, max_length=100)
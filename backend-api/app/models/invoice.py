@@ -1,6 +1,7 @@
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import ConfigDict, BaseModel
 
 
@@ -13,12 +14,25 @@ class InvoiceFiltersMeta(BaseModel):
     cancelled_count: int
 
 
+class InvoiceSummary(BaseModel):
+    """Narrow invoice row for list screens (view=summary / fields=)"""
+    id: int
+    client_id: Optional[int] = None
+    client_name: Optional[str] = None
+    status: Optional[str] = None
+    due_date: Optional[datetime] = None
+    total_amount: Optional[float] = None
+    currency: Optional[str] = None
+    item_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
 class InvoiceItem(SQLModel, table=True):
     __tablename__ = "invoice_items"
 
     id: int = Field(default=None, primary_key=True)
-    invoice_id: int = Field(foreign_key="invoices.id")
-    product_id: int = Field(foreign_key="products.id")
+    invoice_id: int = Field(foreign_key="invoices.id", index=True)
+    product_id: int = Field(foreign_key="products.id", index=True)
     quantity: int = Field(default=1)
     unit_price: float = Field(default=0.0)
     
@@ -27,9 +41,29 @@ class InvoiceItem(SQLModel, table=True):
 
 class Invoice(SQLModel, table=True):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_invoices_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Status-filtered lists and per-status counts
+        Index("ix_invoices_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        # Invoices of the clients matched by a search
+        Index("ix_invoices_user_id_client_id", "user_id", "client_id"),
+        # Amount searches, to the cent (see services.invoice._invoice_search)
+        Index("ix_invoices_user_id_amount", "user_id", text("round(CAST(total_amount AS NUMERIC), 2)")),
+        # Due recurring templates; only recurring invoices have a next run
+        Index("ix_invoices_next_run_at", "next_run_at", postgresql_where=text("next_run_at IS NOT NULL")),
+        # One generated occurrence per template and due date
+        Index("ux_invoices_recurring_source_id_due_date", "recurring_source_id", "due_date", unique=True),
+        # Receivables aging: index-only scan over a user's outstanding invoices
+        Index(
+            "ix_invoices_user_id_outstanding", "user_id", "client_id", "due_date",
+            postgresql_include=["total_amount", "currency"],
+            postgresql_where=text("status = 'sent'"),
+        ),
+    )
 
     id: int = Field(default=None, primary_key=True)
-    client_id: int = Field(foreign_key="clients.id")
+    client_id: int = Field(foreign_key="clients.id", index=True)
     user_id: int = Field(foreign_key="users.id")
     status: str = Field(default="draft")  # draft, sent, paid, cancelled
     due_date: datetime
@@ -38,7 +72,9 @@ class Invoice(SQLModel, table=True):
     
     # Recurring fields
     is_recurring: bool = Field(default=False)
-    recurring_interval: Optional[str] = Field(default=None) # monthly, yearly, etc.
+    recurring_interval: Optional[str] = Field(default=None) # daily, weekly, monthly, quarterly, yearly
+    next_run_at: Optional[datetime] = Field(default=None)  # When the next occurrence is generated
+    recurring_source_id: Optional[int] = Field(default=None, foreign_key="invoices.id", ondelete="SET NULL")  # Template this was generated from
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -47,7 +83,19 @@ class Invoice(SQLModel, table=True):
     items: List[InvoiceItem] = Relationship(back_populates="invoice")
     client: Optional["Client"] = Relationship(back_populates="invoices")
 
+class InvoiceDailyRollup(SQLModel, table=True):
+    """Invoice count and amount per user, day (of created_at), status and currency."""
+    __tablename__ = "invoice_daily_rollup"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    currency: str = Field(primary_key=True, max_length=3)
+    invoice_count: int = Field(default=0)
+    total_amount: float = Field(default=0.0)
+
 class InvoiceItemCreate(SQLModel):
+    id: Optional[int] = None  # Existing item to update (used by InvoiceUpdate)
     product_id: int
     quantity: int
     unit_price: float
@@ -77,6 +125,28 @@ class InvoiceCreate(SQLModel):
         }
     )
 
+# Upper bound on invoices accepted by a single bulk create request
+MAX_BULK_INVOICES = 1000
+
+class InvoiceBulkCreate(SQLModel):
+    invoices: List[InvoiceCreate] = Field(min_length=1, max_length=MAX_BULK_INVOICES)
+
+class InvoiceBulkResult(SQLModel):
+    index: int  # Position of the payload in the request
+    id: Optional[int] = None  # Created invoice id, if successful
+    error: Optional[str] = None  # Validation error, if rejected
+
+class InvoiceBulkResponse(SQLModel):
+    created_count: int
+    error_count: int
+    results: List[InvoiceBulkResult]
+
+# Upper bound on invoices rendered by a single batch PDF request
+MAX_PDF_BATCH = 200
+
+class InvoicePdfBatch(SQLModel):
+    invoice_ids: List[int] = Field(min_length=1, max_length=MAX_PDF_BATCH)
+
 class InvoiceUpdate(SQLModel):
     client_id: Optional[int] = None
     status: Optional[str] = None
@@ -97,6 +167,8 @@ class InvoiceResponse(SQLModel):
     currency: str
     is_recurring: bool
     recurring_interval: Optional[str]
+    next_run_at: Optional[datetime] = None
+    recurring_source_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     items: List[InvoiceItem]
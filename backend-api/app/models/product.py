@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import datetime
@@ -11,6 +12,10 @@ class ProductFiltersMeta(BaseModel):
 
 class Product(SQLModel, table=True):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_products_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     name: str = Field(index=True, max_length=100)
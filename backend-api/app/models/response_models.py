@@ -11,6 +11,7 @@ class Meta(BaseModel):
     page: int  # Current page number (1-indexed)
     limit: int  # Items per page
     filters: Optional[Dict[str, Any]] = None  # Optional filter statistics (model-specific)
+    next_cursor: Optional[str] = None  # Opaque cursor for the next page (keyset pagination)
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -21,3 +22,17 @@ class PaginatedResponse(BaseModel, Generic[T]):
     class Config:
         # Allow arbitrary types for generic support
         arbitrary_types_allowed = True
+
+
+class ImportRowError(BaseModel):
+    """A CSV row rejected by an import"""
+    line: int  # Line number in the file (the header is line 1)
+    error: str
+
+
+class ImportResult(BaseModel):
+    """Outcome of a CSV import"""
+    created_count: int
+    error_count: int
+    errors: list[ImportRowError]  # The first errors only, see errors_truncated
+    errors_truncated: bool = False
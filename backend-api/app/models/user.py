@@ -1,3 +1,4 @@
+from sqlalchemy import DDL, Index, event
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import datetime
@@ -13,6 +14,10 @@ class UserFiltersMeta(BaseModel):
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     email: str = Field(unique=True, index=True, max_length=255)
@@ -23,6 +28,60 @@ class User(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TenantDataVersion(SQLModel, table=True):
+    """
+    Per-user counter bumped (by triggers) on every write to the user's clients,
+    products or invoices. List ETags are built from it instead of scanning the rows;
+    the same triggers NOTIFY TENANT_DATA_CHANNEL for cross-worker cache invalidation.
+    """
+    __tablename__ = "tenant_data_versions"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True, ondelete="CASCADE")
+    version: int = Field(default=0)
+
+
+# Tables whose writes bump the owner's data version. Invoice items are covered
+# by their invoice, which every item change updates (total, updated_at).
+TENANT_DATA_TABLES = ("clients", "products", "invoices")
+
+# Postgres channel carrying the ids of users whose data changed, sent on commit
+TENANT_DATA_CHANNEL = "tenant_data_changed"
+
+# Statement-level, so a multi-row write bumps (and notifies) each user once. Versions
+# are upserted in user_id order so concurrent writers lock them in the same order.
+_BUMP_TENANT_DATA_VERSION = """
+CREATE OR REPLACE FUNCTION bump_tenant_data_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO tenant_data_versions (user_id, version)
+        SELECT DISTINCT user_id, 1 FROM old_rows ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET version = tenant_data_versions.version + 1;
+        PERFORM pg_notify('tenant_data_changed', user_id::text) FROM (SELECT DISTINCT user_id FROM old_rows) AS changed;
+    ELSE
+        INSERT INTO tenant_data_versions (user_id, version)
+        SELECT DISTINCT user_id, 1 FROM new_rows ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET version = tenant_data_versions.version + 1;
+        PERFORM pg_notify('tenant_data_changed', user_id::text) FROM (SELECT DISTINCT user_id FROM new_rows) AS changed;
+    END IF;
+    RETURN NULL;
+END $$
+"""
+
+# Transition tables allow one event per trigger
+_TENANT_DATA_TRIGGERS = [
+    f"CREATE OR REPLACE TRIGGER {table}_bump_version_{event_name.lower()} AFTER {event_name} ON {table} "
+    f"REFERENCING {'OLD' if event_name == 'DELETE' else 'NEW'} TABLE AS {'old_rows' if event_name == 'DELETE' else 'new_rows'} "
+    f"FOR EACH STATEMENT EXECUTE FUNCTION bump_tenant_data_version()"
+    for table in TENANT_DATA_TABLES
+    for event_name in ("INSERT", "UPDATE", "DELETE")
+]
+
+# Migrations create these too; this covers metadata.create_all
+for _statement in [_BUMP_TENANT_DATA_VERSION, *_TENANT_DATA_TRIGGERS]:
+    event.listen(SQLModel.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class UserCreate(SQLModel):
     email: str
     full_name: str
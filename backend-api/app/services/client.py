@@ -1,13 +1,23 @@
 from sqlmodel import Session, select, func
 from app.models.client import Client, ClientCreate, ClientUpdate
+from app.core.pagination import Cursor, paginate
 from datetime import datetime
+from typing import Optional
+from app.services.stats import invalidate_dashboard_counts
 
 def get_client(db: Session, client_id: int, user_id: int) -> Client:
     return db.exec(select(Client).where(Client.id == client_id, Client.user_id == user_id)).first()
 
-def get_clients(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None):
+def get_client_watermark(db: Session, client_id: int, user_id: int):
+    """Change marker for a single client (its updated_at), used for ETags. None if not found."""
+    return db.exec(
+        select(Client.updated_at).where(Client.id == client_id, Client.user_id == user_id)
+    ).first()
+
+def get_clients(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None, after: Optional[Cursor] = None):
     """
     Get clients for a user with pagination.
+    Pass `after` (a decoded cursor) for keyset pagination instead of `skip`.
     Returns tuple of (clients, total_count, all_count)
     """
     query = select(Client).where(Client.user_id == user_id)
@@ -26,7 +36,7 @@ def get_clients(db: Session, user_id: int, skip: int = 0, limit: int = 100, sear
     all_count = db.exec(select(func.count()).where(Client.user_id == user_id)).one()
     
     # Get paginated clients
-    clients = db.exec(query.offset(skip).limit(limit)).all()
+    clients = db.exec(paginate(query, Client, skip=skip, limit=limit, after=after)).all()
     
     return clients, total_count, all_count
 
@@ -38,6 +48,7 @@ def create_client(db: Session, client: ClientCreate, user_id: int) -> Client:
     db.add(db_client)
     db.commit()
     db.refresh(db_client)
+    invalidate_dashboard_counts(user_id)
     return db_client
 
 def update_client(db: Session, client_id: int, client_update: ClientUpdate, user_id: int) -> Client:
@@ -62,4 +73,5 @@ def delete_client(db: Session, client_id: int, user_id: int) -> bool:
 
     db.delete(db_client)
     db.commit()
+    invalidate_dashboard_counts(user_id)
     return True
@@ -0,0 +1,151 @@
+import csv
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Type
+from pydantic import ValidationError
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.client import Client, ClientCreate
+from app.models.product import Product, ProductCreate
+from app.models.response_models import ImportResult, ImportRowError
+from app.services.stats import invalidate_dashboard_counts
+
+# Rows validated and inserted per transaction
+IMPORT_BATCH_SIZE = 1000
+# Row errors kept for the report; further errors are only counted
+MAX_IMPORT_ERRORS = 1000
+
+# (input model, table model) per importable kind
+IMPORT_KINDS: Dict[str, Tuple[Type[SQLModel], Type[SQLModel]]] = {
+    "clients": (ClientCreate, Client),
+    "products": (ProductCreate, Product),
+}
+
+# A CSV line number (header is line 1) and its fields
+CsvRow = Tuple[int, Dict[str, Optional[str]]]
+
+
+def iter_csv_batches(stream: TextIO, batch_size: int = IMPORT_BATCH_SIZE) -> Iterator[List[CsvRow]]:
+    """
+    Read a CSV with a header row lazily, yielding batches of (line, fields).
+    Empty fields become None so optional columns fall back to their defaults.
+    Only one batch is held in memory at a time.
+    """
+    reader = csv.DictReader(stream)
+    batch = []
+    for fields in reader:
+        row = {key.strip(): (value.strip() or None) if isinstance(value, str) else None
+               for key, value in fields.items() if key}
+        batch.append((reader.line_num, row))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _column_error(table_model: Type[SQLModel], values: dict) -> Optional[str]:
+    """Check values against the table's column lengths, which the input models do not enforce."""
+    for field, value in values.items():
+        length = getattr(table_model.__table__.c[field].type, "length", None)
+        if length and isinstance(value, str) and len(value) > length:
+            return f"{field}: at most {length} characters"
+    return None
+
+
+def validate_batch(kind: str, rows: Iterable[CsvRow]) -> Tuple[List[dict], List[ImportRowError]]:
+    """Validate rows with the kind's Create model. Returns (valid values, row errors)."""
+    input_model, table_model = IMPORT_KINDS[kind]
+    valid, errors = [], []
+    for line, fields in rows:
+        try:
+            values = input_model.model_validate(
+                {key: value for key, value in fields.items() if value is not None}
+            ).model_dump()
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            errors.append(ImportRowError(line=line, error=f"{location}: {error['msg']}"))
+            continue
+        column_error = _column_error(table_model, values)
+        if column_error:
+            errors.append(ImportRowError(line=line, error=column_error))
+            continue
+        valid.append(values)
+    return valid, errors
+
+
+def insert_batch(db: Session, kind: str, rows: List[dict], user_id: int) -> int:
+    """Insert validated rows with one multi-row INSERT and commit. Returns the row count."""
+    if not rows:
+        return 0
+    _, table_model = IMPORT_KINDS[kind]
+    now = datetime.utcnow()
+    db.exec(
+        insert(table_model),
+        params=[{**row, "user_id": user_id, "created_at": now, "updated_at": now} for row in rows]
+    )
+    db.commit()
+    return len(rows)
+
+
+class ImportReport:
+    """Accumulates batch outcomes into an ImportResult, keeping at most MAX_IMPORT_ERRORS errors."""
+
+    def __init__(self):
+        self.result = ImportResult(created_count=0, error_count=0, errors=[])
+
+    def add(self, created: int, errors: List[ImportRowError]) -> None:
+        self.result.created_count += created
+        self.result.error_count += len(errors)
+        room = MAX_IMPORT_ERRORS - len(self.result.errors)
+        self.result.errors.extend(errors[:max(0, room)])
+        self.result.errors_truncated = self.result.error_count > len(self.result.errors)
+
+
+def _validated_batches(kind: str, stream: TextIO, batch_size: int) -> Iterator[Tuple[List[dict], List[ImportRowError]]]:
+    """
+    Validated batches of a CSV stream. A file that cannot be decoded or parsed
+    ends the import at that point, reported as an error on the following line.
+    """
+    last_line = 1
+    try:
+        for batch in iter_csv_batches(stream, batch_size):
+            last_line = batch[-1][0]
+            yield validate_batch(kind, batch)
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield [], [ImportRowError(line=last_line + 1, error=f"Unreadable CSV, import stopped: {e}")]
+
+
+def import_csv(db: Session, kind: str, stream: TextIO, user_id: int, batch_size: int = IMPORT_BATCH_SIZE) -> ImportResult:
+    """
+    Import a CSV of clients or products for a user, batch by batch.
+    Invalid rows are reported and skipped; each batch of valid rows is
+    committed on its own, so one bad row never aborts the file.
+    """
+    report = ImportReport()
+    for valid, errors in _validated_batches(kind, stream, batch_size):
+        report.add(insert_batch(db, kind, valid, user_id), errors)
+    if report.result.created_count:
+        invalidate_dashboard_counts(user_id)
+    return report.result
+
+
+async def import_csv_async(
+    db: AsyncSession, kind: str, stream: TextIO, user_id: int, batch_size: int = IMPORT_BATCH_SIZE
+) -> ImportResult:
+    """
+    import_csv for request handlers. Each batch is read (an upload may have
+    spilled to disk), parsed and validated in the threadpool, then inserted
+    with an awaited run_sync, so the event loop only waits on I/O.
+    """
+    report = ImportReport()
+    batches = _validated_batches(kind, stream, batch_size)
+    while (batch := await run_in_threadpool(next, batches, None)) is not None:
+        valid, errors = batch
+        created = await db.run_sync(insert_batch, kind=kind, rows=valid, user_id=user_id)
+        report.add(created, errors)
+    if report.result.created_count:
+        invalidate_dashboard_counts(user_id)
+    return report.result
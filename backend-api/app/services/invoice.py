@@ -1,69 +1,271 @@
-from sqlmodel import Session, select, func
-from app.models.invoice import Invoice, InvoiceCreate, InvoiceUpdate, InvoiceItem
+from sqlmodel import Session, select, func, insert, update, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.invoice import Invoice, InvoiceCreate, InvoiceUpdate, InvoiceItem, InvoiceItemCreate, InvoiceBulkResult
 from app.models.client import Client
+from app.models.product import Product
+from app.core.pagination import Cursor, paginate
+from app.services.recurring import next_run_after
+from app.services.pdf import invoice_pdf_payload
+from app.services.rollup import add_to_rollups, remove_from_rollups
+from app.services.stats import invalidate_dashboard_counts
+import re
 from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import Numeric, case, cast, false, or_, union_all
 from sqlalchemy.orm import selectinload
 
-def get_invoice(db: Session, invoice_id: int, user_id: int) -> Invoice:
-    return db.exec(
+INVOICE_STATUSES = ("draft", "sent", "paid", "cancelled")
+
+# Amount search terms: plain digits with up to two decimals (no signs, exponents, nan/inf)
+AMOUNT_TERM = re.compile(r"\d+(\.\d{1,2})?")
+
+def get_invoice(db: Session, invoice_id: int, user_id: int, for_update: bool = False) -> Invoice:
+    """
+    Get an invoice with its client and items. `for_update` locks the invoice row
+    until the transaction ends (and reloads it), so concurrent writers to the
+    same invoice take turns and each sees the other's committed values.
+    """
+    query = (
         select(Invoice)
         .where(Invoice.id == invoice_id, Invoice.user_id == user_id)
         .options(selectinload(Invoice.client))
         .options(selectinload(Invoice.items))
+    )
+    if for_update:
+        query = query.with_for_update(of=Invoice).execution_options(populate_existing=True)
+    return db.exec(query).first()
+
+def get_invoice_status_counts(db: Session, user_id: int, *conditions):
+    """
+    Count a user's invoices per status in a single aggregate query.
+    Any extra conditions are counted as an additional `filtered_count` column
+    so the filtered total comes out of the same scan.
+    Returns row with (all_count, draft_count, sent_count, paid_count, cancelled_count, filtered_count)
+    """
+    filtered_count = func.count().filter(*conditions) if conditions else func.count()
+    return db.exec(
+        select(
+            func.count().label("all_count"),
+            func.count().filter(Invoice.status == "draft").label("draft_count"),
+            func.count().filter(Invoice.status == "sent").label("sent_count"),
+            func.count().filter(Invoice.status == "paid").label("paid_count"),
+            func.count().filter(Invoice.status == "cancelled").label("cancelled_count"),
+            filtered_count.label("filtered_count"),
+        ).where(Invoice.user_id == user_id)
+    ).one()
+
+def get_invoice_watermark(db: Session, invoice_id: int, user_id: int):
+    """
+    Change marker for a single invoice, used for ETags.
+    Returns row of (updated_at, client_updated_at), or None if not found.
+    """
+    return db.exec(
+        select(Invoice.updated_at, Client.updated_at)
+        .join(Client, Client.id == Invoice.client_id)
+        .where(Invoice.id == invoice_id, Invoice.user_id == user_id)
     ).first()
 
-def get_invoices(db: Session, user_id: int, skip: int = 0, limit: int = 100, status: str = None, search: str = None):
+def _parse_amount(term: str) -> Optional[Decimal]:
+    """An amount search term (digits with up to two decimals, e.g. 100 or 99.50), or None."""
+    return Decimal(term) if AMOUNT_TERM.fullmatch(term) else None
+
+def _invoice_search(user_id: int, search: str):
+    """
+    Build the search filter and relevance rank for a free-text invoice search.
+    Matches client name/email (substring, backed by trigram indexes), invoice id,
+    status and total amount (to the cent). The filter is the union of one
+    index-backed id lookup per kind of match, so rare matches (an amount, an id)
+    never filter all of the tenant's invoices. Returns tuple of (condition, rank)
+    """
+    term = search.strip()
+    pattern = f"%{term}%"
+
+    matching_clients = select(Client.id).where(
+        Client.user_id == user_id,
+        or_(Client.name.ilike(pattern), Client.email.ilike(pattern))
+    )
+    prefix_clients = select(Client.id).where(
+        Client.user_id == user_id,
+        or_(Client.name.ilike(f"{term}%"), Client.email.ilike(f"{term}%"))
+    )
+
+    matches = [Invoice.client_id.in_(matching_clients)]
+    id_match = status_match = amount_match = false()
+    if term.isdigit():
+        id_match = Invoice.id == int(term)
+        matches.append(id_match)
+    if term.lower() in INVOICE_STATUSES:
+        status_match = Invoice.status == term.lower()
+        matches.append(status_match)
+    amount = _parse_amount(term)
+    if amount is not None:
+        # Same expression as the ix_invoices_user_id_amount index
+        amount_match = func.round(cast(Invoice.total_amount, Numeric), 2) == amount
+        matches.append(amount_match)
+
+    matching_ids = union_all(*(select(Invoice.id).where(Invoice.user_id == user_id, match) for match in matches))
+    condition = Invoice.id.in_(matching_ids)
+    rank = case(
+        (id_match, 3),
+        (or_(status_match, amount_match), 2),
+        (Invoice.client_id.in_(prefix_clients), 1),
+        else_=0
+    )
+    return condition, rank
+
+def _summary_columns():
+    """Columns available to summary (sparse fieldset) invoice lists, by field name."""
+    item_count = (
+        select(func.count(InvoiceItem.id))
+        .where(InvoiceItem.invoice_id == Invoice.id)
+        .correlate(Invoice)
+        .scalar_subquery()
+    )
+    return {
+        "id": Invoice.id,
+        "client_id": Invoice.client_id,
+        "client_name": Client.name,
+        "status": Invoice.status,
+        "due_date": Invoice.due_date,
+        "total_amount": Invoice.total_amount,
+        "currency": Invoice.currency,
+        "item_count": item_count,
+        "created_at": Invoice.created_at,
+    }
+
+INVOICE_SUMMARY_FIELDS = tuple(_summary_columns())
+
+def get_invoices(db: Session, user_id: int, skip: int = 0, limit: int = 100, status: str = None, search: str = None, after: Optional[Cursor] = None, fields: Optional[List[str]] = None):
     """
     Get invoices for a user with pagination.
+    Pass `after` (a decoded cursor) for keyset pagination instead of `skip`.
+    With `search`, offset pages are ordered by relevance before (created_at, id).
+    With `fields` (names from INVOICE_SUMMARY_FIELDS), only those columns (plus id
+    and created_at) are selected as rows and client/items are not loaded.
     Returns tuple of (invoices, total_count, all_count, draft_count, sent_count, paid_count, cancelled_count)
     """
-    # Base query for counts (all user invoices)
-    base_query = select(Invoice).where(Invoice.user_id == user_id)
-    
-    # Get total count with filters (if any)
-    # For the list, we apply status filter
-    list_query = base_query
+    # List filters on top of the user's invoices
+    conditions = []
     if status and status != "all":
-        list_query = list_query.where(Invoice.status == status)
-        
-    if search:
-        # Simple search by ID for now, as joining with Client requires more changes
-        # Check if search is numeric
-        if search.isdigit():
-            list_query = list_query.where(Invoice.id == int(search))
-        
-    # Get total count for the current filtered list
-    total_count = db.exec(select(func.count()).select_from(list_query.subquery())).one()
-    
-    # Get counts for filter statistics (per status) - these should be based on ALL invoices
-    all_count = db.exec(select(func.count()).select_from(base_query.subquery())).one()
-    
-    draft_count = db.exec(
-        select(func.count()).where(Invoice.user_id == user_id, Invoice.status == "draft")
-    ).one()
-    
-    sent_count = db.exec(
-        select(func.count()).where(Invoice.user_id == user_id, Invoice.status == "sent")
-    ).one()
-    
-    paid_count = db.exec(
-        select(func.count()).where(Invoice.user_id == user_id, Invoice.status == "paid")
-    ).one()
-    
-    cancelled_count = db.exec(
-        select(func.count()).where(Invoice.user_id == user_id, Invoice.status == "cancelled")
-    ).one()
+        conditions.append(Invoice.status == status)
+
+    if fields:
+        columns = _summary_columns()
+        selected = dict.fromkeys(["id", "created_at", *fields])
+        list_query = select(*(columns[field].label(field) for field in selected)).select_from(Invoice)
+        if "client_name" in selected:
+            list_query = list_query.join(Client, Client.id == Invoice.client_id)
+    else:
+        list_query = select(Invoice)
+
+    if search and search.strip():
+        search_condition, rank = _invoice_search(user_id, search)
+        conditions.append(search_condition)
+        # Relevance ordering is only stable for offset pages; keyset pages
+        # follow the plain (created_at, id) order
+        if after is None:
+            list_query = list_query.order_by(rank.desc())
+
+    # Filtered total and per-status counts (based on ALL invoices) in one pass
+    counts = get_invoice_status_counts(db, user_id, *conditions)
     
     # Get paginated invoices
+    page_query = paginate(
+        list_query.where(Invoice.user_id == user_id, *conditions),
+        Invoice, skip=skip, limit=limit, after=after
+    )
+    if not fields:
+        page_query = page_query.options(selectinload(Invoice.client)).options(selectinload(Invoice.items))
+    invoices = db.exec(page_query).all()
+    
+    return (
+        invoices,
+        counts.filtered_count,
+        counts.all_count,
+        counts.draft_count,
+        counts.sent_count,
+        counts.paid_count,
+        counts.cancelled_count,
+    )
+
+def _item_rows(invoice_id: int, items) -> List[dict]:
+    """Parameter rows for a multi-row InvoiceItem insert."""
+    return [
+        {
+            "invoice_id": invoice_id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "unit_price": item.unit_price,
+        }
+        for item in items
+    ]
+
+def get_invoice_pdf_payloads(db: Session, invoice_ids: List[int], user_id: int) -> List[dict]:
+    """
+    Load the user's invoices (with client, items and product names) as PDF payloads.
+    Invoices that do not exist or belong to another user are left out.
+    Returns payloads in the order of invoice_ids.
+    """
     invoices = db.exec(
-        list_query
-        .offset(skip)
-        .limit(limit)
+        select(Invoice)
+        .where(Invoice.id.in_(invoice_ids), Invoice.user_id == user_id)
         .options(selectinload(Invoice.client))
         .options(selectinload(Invoice.items))
     ).all()
-    
-    return invoices, total_count, all_count, draft_count, sent_count, paid_count, cancelled_count
+
+    product_ids = {item.product_id for invoice in invoices for item in invoice.items}
+    product_names = dict(db.exec(
+        select(Product.id, Product.name).where(Product.id.in_(product_ids))
+    ).all()) if product_ids else {}
+
+    by_id = {invoice.id: invoice for invoice in invoices}
+    return [
+        invoice_pdf_payload(by_id[invoice_id], product_names)
+        for invoice_id in dict.fromkeys(invoice_ids) if invoice_id in by_id
+    ]
+
+# Flat invoice columns streamed by the export endpoint
+EXPORT_COLUMNS = (
+    Invoice.id,
+    Invoice.client_id,
+    Client.name.label("client_name"),
+    Invoice.status,
+    Invoice.due_date,
+    Invoice.total_amount,
+    Invoice.currency,
+    Invoice.is_recurring,
+    Invoice.recurring_interval,
+    Invoice.created_at,
+    Invoice.updated_at,
+)
+
+async def stream_invoices_for_export(
+    db: AsyncSession,
+    user_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    batch_size: int = 1000
+):
+    """
+    Yield a user's invoices (created in [date_from, date_to)) as batches of row mappings.
+    Rows come from a server-side cursor, so memory stays bounded by batch_size
+    regardless of how many invoices are exported.
+    """
+    query = (
+        select(*EXPORT_COLUMNS)
+        .join(Client, Client.id == Invoice.client_id)
+        .where(Invoice.user_id == user_id)
+        .order_by(Invoice.created_at, Invoice.id)
+    )
+    if date_from:
+        query = query.where(Invoice.created_at >= date_from)
+    if date_to:
+        query = query.where(Invoice.created_at < date_to)
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.mappings().partitions():
+        yield partition
 
 def create_invoice(db: Session, invoice: InvoiceCreate, user_id: int) -> Invoice:
     # Calculate total amount
@@ -79,25 +281,99 @@ def create_invoice(db: Session, invoice: InvoiceCreate, user_id: int) -> Invoice
         recurring_interval=invoice.recurring_interval,
         total_amount=total_amount
     )
+    if invoice.is_recurring:
+        db_invoice.next_run_at = next_run_after(db_invoice.created_at, invoice.recurring_interval)
     db.add(db_invoice)
-    db.commit()
-    db.refresh(db_invoice)
-    
-    for item in invoice.items:
-        db_item = InvoiceItem(
-            invoice_id=db_invoice.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            unit_price=item.unit_price
+
+    # Flush to get the invoice id, then insert all items in one batch; a
+    # single commit makes the invoice visible only once it is complete
+    db.flush()
+    invoice_id = db_invoice.id
+    if invoice.items:
+        db.exec(
+            insert(InvoiceItem),
+            params=_item_rows(invoice_id, invoice.items)
         )
-        db.add(db_item)
-    
+    add_to_rollups(db, [invoice_id])
     db.commit()
-    db.refresh(db_invoice)
-    return db_invoice
+    invalidate_dashboard_counts(user_id)
+
+    # Reload with client and items eager-loaded for the response
+    return get_invoice(db, invoice_id, user_id)
+
+def create_invoices_bulk(db: Session, invoices: List[InvoiceCreate], user_id: int) -> List[InvoiceBulkResult]:
+    """
+    Create many invoices in one transaction with multi-row inserts.
+    Payloads referencing clients or products the user does not own are rejected
+    individually; the rest are inserted together.
+    Returns one InvoiceBulkResult per payload, in request order.
+    """
+    client_ids = {invoice.client_id for invoice in invoices}
+    product_ids = {item.product_id for invoice in invoices for item in invoice.items}
+
+    # Validate references with one query per table instead of per row
+    owned_clients = set(db.exec(
+        select(Client.id).where(Client.user_id == user_id, Client.id.in_(client_ids))
+    ).all())
+    owned_products = set(db.exec(
+        select(Product.id).where(Product.user_id == user_id, Product.id.in_(product_ids))
+    ).all()) if product_ids else set()
+
+    results = []
+    accepted = []
+    for index, invoice in enumerate(invoices):
+        if invoice.client_id not in owned_clients:
+            results.append(InvoiceBulkResult(index=index, error=f"Client {invoice.client_id} not found"))
+            continue
+        missing = sorted({item.product_id for item in invoice.items} - owned_products)
+        if missing:
+            results.append(InvoiceBulkResult(index=index, error=f"Product {missing[0]} not found"))
+            continue
+        result = InvoiceBulkResult(index=index)
+        results.append(result)
+        accepted.append((result, invoice))
+
+    if not accepted:
+        return results
+
+    now = datetime.utcnow()
+    invoice_rows = [
+        {
+            "client_id": invoice.client_id,
+            "user_id": user_id,
+            "status": invoice.status,
+            "due_date": invoice.due_date,
+            "currency": invoice.currency,
+            "is_recurring": invoice.is_recurring,
+            "recurring_interval": invoice.recurring_interval,
+            "next_run_at": next_run_after(now, invoice.recurring_interval) if invoice.is_recurring else None,
+            "total_amount": sum(item.quantity * item.unit_price for item in invoice.items),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for _, invoice in accepted
+    ]
+    # RETURNING ids in parameter order so they line up with the payloads
+    invoice_ids = db.exec(
+        insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+        params=invoice_rows
+    ).scalars().all()
+
+    item_rows = []
+    for (result, invoice), invoice_id in zip(accepted, invoice_ids):
+        result.id = invoice_id
+        item_rows.extend(_item_rows(invoice_id, invoice.items))
+    if item_rows:
+        db.exec(insert(InvoiceItem), params=item_rows)
+
+    add_to_rollups(db, invoice_ids)
+    db.commit()
+    invalidate_dashboard_counts(user_id)
+    return results
 
 def update_invoice(db: Session, invoice_id: int, invoice_update: InvoiceUpdate, user_id: int) -> Invoice:
-    db_invoice = get_invoice(db, invoice_id, user_id)
+    # Locked, so concurrent updates cannot both subtract the same old values from the rollups
+    db_invoice = get_invoice(db, invoice_id, user_id, for_update=True)
     if not db_invoice:
         return None
 
@@ -105,41 +381,92 @@ def update_invoice(db: Session, invoice_id: int, invoice_update: InvoiceUpdate,
     
     # Handle items update separately
     items_data = update_data.pop("items", None)
+
+    # Move the invoice between rollup rows if its status or total can change
+    affects_rollups = items_data is not None or "status" in update_data
+    if affects_rollups:
+        remove_from_rollups(db, [invoice_id])
     
+    recurrence = (db_invoice.is_recurring, db_invoice.recurring_interval)
     for field, value in update_data.items():
         setattr(db_invoice, field, value)
 
+    # Reschedule when the recurrence is switched on/off or its interval changes
+    if (db_invoice.is_recurring, db_invoice.recurring_interval) != recurrence:
+        db_invoice.next_run_at = (
+            next_run_after(datetime.utcnow(), db_invoice.recurring_interval)
+            if db_invoice.is_recurring else None
+        )
+
     if items_data is not None:
-        # Delete existing items
-        for item in db_invoice.items:
-            db.delete(item)
-        
-        # Create new items
-        new_items = []
-        for item_data in items_data:
-            db_item = InvoiceItem(
-                invoice_id=db_invoice.id,
-                product_id=item_data["product_id"],
-                quantity=item_data["quantity"],
-                unit_price=item_data["unit_price"]
-            )
-            db.add(db_item)
-            new_items.append(db_item)
-            
-        # Recalculate total amount
-        total_amount = sum(item.quantity * item.unit_price for item in new_items)
-        db_invoice.total_amount = total_amount
+        _sync_invoice_items(db, db_invoice, items_data)
 
     db_invoice.updated_at = datetime.utcnow()
     db.add(db_invoice)
+    if affects_rollups:
+        add_to_rollups(db, [invoice_id])
     db.commit()
-    db.refresh(db_invoice)
-    return db_invoice
+    if "status" in update_data:
+        invalidate_dashboard_counts(user_id)
+
+    # Reload with client and items eager-loaded for the response
+    return get_invoice(db, invoice_id, user_id)
+
+def _sync_invoice_items(db: Session, db_invoice: Invoice, items_data: List[dict]) -> None:
+    """
+    Apply the submitted item list as a diff against the invoice's current items.
+    Items are matched by id: matches are updated only if changed, items without
+    a (known) id are inserted, and existing items not submitted are deleted.
+    Each kind of change is a single batched statement, and total_amount is
+    recomputed in SQL from the resulting item set.
+    """
+    existing = {item.id: item for item in db_invoice.items}
+    fields = ("product_id", "quantity", "unit_price")
+
+    to_insert = []
+    to_update = []
+    kept_ids = set()
+    for item_data in items_data:
+        db_item = existing.get(item_data.get("id"))
+        if db_item is None or db_item.id in kept_ids:
+            to_insert.append(item_data)
+            continue
+        kept_ids.add(db_item.id)
+        if any(getattr(db_item, field) != item_data[field] for field in fields):
+            to_update.append({"id": db_item.id, **{field: item_data[field] for field in fields}})
+    to_delete = [item_id for item_id in existing if item_id not in kept_ids]
+
+    if to_delete:
+        db.exec(
+            delete(InvoiceItem)
+            .where(InvoiceItem.id.in_(to_delete))
+            .execution_options(synchronize_session=False)
+        )
+    if to_update:
+        # ORM bulk UPDATE by primary key (executemany)
+        db.exec(update(InvoiceItem), params=to_update)
+    if to_insert:
+        new_items = [InvoiceItemCreate(**item_data) for item_data in to_insert]
+        db.exec(insert(InvoiceItem), params=_item_rows(db_invoice.id, new_items))
+
+    # Recalculate total amount from the final item set
+    db.exec(
+        update(Invoice)
+        .where(Invoice.id == db_invoice.id)
+        .values(
+            total_amount=select(func.coalesce(func.sum(InvoiceItem.quantity * InvoiceItem.unit_price), 0.0))
+            .where(InvoiceItem.invoice_id == db_invoice.id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
 
 def delete_invoice(db: Session, invoice_id: int, user_id: int) -> bool:
-    db_invoice = get_invoice(db, invoice_id, user_id)
+    db_invoice = get_invoice(db, invoice_id, user_id, for_update=True)
     if not db_invoice:
         return False
+
+    remove_from_rollups(db, [invoice_id])
         
     # Delete items first (cascade should handle this usually, but explicit is safe)
     for item in db_invoice.items:
@@ -147,4 +474,5 @@ def delete_invoice(db: Session, invoice_id: int, user_id: int) -> bool:
 
     db.delete(db_invoice)
     db.commit()
+    invalidate_dashboard_counts(user_id)
     return True
@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+
+# A4 in PDF points, with a one-inch margin
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 72
+FONT_SIZE = 10
+LEADING = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+_pool: Optional[ProcessPoolExecutor] = None
+_last_sweep = 0.0
+
+
+def invoice_pdf_payload(invoice, product_names: Dict[int, str]) -> dict:
+    """
+    Snapshot of everything printed on an invoice PDF.
+    The payload is plain data so it can be hashed and sent to a worker process.
+    """
+    client = invoice.client
+    return {
+        "id": invoice.id,
+        "status": invoice.status,
+        "currency": invoice.currency,
+        "due_date": invoice.due_date.isoformat(),
+        "created_at": invoice.created_at.isoformat(),
+        "updated_at": invoice.updated_at.isoformat(),
+        "total_amount": invoice.total_amount,
+        "client": {
+            "name": client.name,
+            "email": client.email,
+            "address": client.address,
+        } if client else None,
+        "items": [
+            {
+                "product": product_names.get(item.product_id, f"Product {item.product_id}"),
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+            }
+            for item in sorted(invoice.items, key=lambda item: item.id)
+        ],
+    }
+
+
+def pdf_cache_key(payload: dict) -> str:
+    """Content address of a rendered PDF: changes whenever the invoice does."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def pdf_cache_path(payload: dict) -> str:
+    key = pdf_cache_key(payload)
+    return os.path.join(settings.PDF_CACHE_DIR, key[:2], f"{key}.pdf")
+
+
+def _text_lines(payload: dict) -> List[str]:
+    currency = payload["currency"]
+    lines = [
+        f"INVOICE #{payload['id']}",
+        "",
+        f"Status: {payload['status']}",
+        f"Issued: {payload['created_at'][:10]}",
+        f"Due: {payload['due_date'][:10]}",
+        "",
+    ]
+    client = payload["client"]
+    if client:
+        lines += ["Bill to:", client["name"], client["email"]]
+        if client["address"]:
+            lines.append(client["address"])
+        lines.append("")
+
+    lines.append(f"{'Item':<40} {'Qty':>6} {'Unit price':>14} {'Amount':>14}")
+    for item in payload["items"]:
+        amount = item["quantity"] * item["unit_price"]
+        lines.append(
+            f"{item['product'][:40]:<40} {item['quantity']:>6} "
+            f"{item['unit_price']:>14,.2f} {amount:>14,.2f}"
+        )
+    lines += ["", f"{'Total (' + currency + ')':<61} {payload['total_amount']:>14,.2f}"]
+    return lines
+
+
+def _escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_invoice_pdf(payload: dict) -> bytes:
+    """Render an invoice payload as a plain-text, multi-page PDF document."""
+    lines = _text_lines(payload)
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for page_lines in pages:
+        stream = [f"BT /F1 {FONT_SIZE} Tf {LEADING} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+        stream += [f"({_escape(line)}) '" for line in page_lines]
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+
+        page_number = len(objects) + 1
+        page_refs.append(f"{page_number} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def render_to_cache(payload: dict, path: str) -> str:
+    """Render a payload into the cache file at `path` (atomically). Runs in a worker process."""
+    pdf = build_invoice_pdf(payload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(pdf)
+    os.replace(tmp_path, path)
+    return path
+
+
+def zip_files(entries: List[Tuple[str, str]]) -> bytes:
+    """Zip (archive name, file path) entries into an in-memory archive. Runs in a worker process."""
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, path in entries:
+            archive.write(path, arcname=name)
+    return out.getvalue()
+
+
+def prune_pdf_cache(cache_dir: str, max_bytes: float = 0, max_age: float = 0) -> Tuple[int, int]:
+    """
+    Evict cached PDFs: files not served for `max_age` seconds, then the least
+    recently served ones until the cache is within `max_bytes` (0 disables a cap).
+    Serving a PDF refreshes its mtime, so mtime order is LRU order.
+    Returns (files removed, bytes removed).
+    """
+    files = []
+    for root, _, names in os.walk(cache_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    total = sum(size for _, size, _ in files)
+    cutoff = time.time() - max_age if max_age else None
+    removed, removed_bytes = 0, 0
+    for mtime, size, path in files:
+        expired = cutoff is not None and mtime < cutoff
+        if not expired and (not max_bytes or total <= max_bytes):
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+        removed_bytes += size
+    return removed, removed_bytes
+
+
+def _maybe_sweep_cache() -> None:
+    """Queue a cache sweep on the render pool if none ran in this process for a while."""
+    global _last_sweep
+    if not (settings.PDF_CACHE_MAX_MB or settings.PDF_CACHE_MAX_AGE_DAYS):
+        return
+    now = time.monotonic()
+    if _last_sweep and now - _last_sweep < settings.PDF_CACHE_SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+    get_render_pool().submit(
+        prune_pdf_cache, settings.PDF_CACHE_DIR,
+        settings.PDF_CACHE_MAX_MB * 1024 * 1024, settings.PDF_CACHE_MAX_AGE_DAYS * 86400
+    )
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all PDF requests in this worker, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render pool's worker processes, dropping queued work. Called on app shutdown."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def render_invoice_pdf(payload: dict) -> str:
+    """
+    Return the path of the cached PDF for a payload, rendering it in the
+    process pool on a cache miss. Neither the event loop nor the threadpool
+    does any rendering work.
+    """
+    path = pdf_cache_path(payload)
+    try:
+        # Mark as recently served for LRU eviction
+        os.utime(path)
+        cached = True
+    except FileNotFoundError:
+        cached = False
+    CACHE_REQUESTS.labels("invoice_pdf", "hit" if cached else "miss").inc()
+    if not cached:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(get_render_pool(), render_to_cache, payload, path)
+        _maybe_sweep_cache()
+    return path
+
+
+async def render_invoice_pdf_zip(payloads: List[dict]) -> bytes:
+    """Render many invoices in parallel and bundle them into a zip archive."""
+    paths = await asyncio.gather(*(render_invoice_pdf(payload) for payload in payloads))
+    entries = [(f"invoice-{payload['id']}.pdf", path) for payload, path in zip(payloads, paths)]
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_render_pool(), zip_files, entries)
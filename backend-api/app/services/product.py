@@ -1,13 +1,23 @@
 from sqlmodel import Session, select, func
 from app.models.product import Product, ProductCreate, ProductUpdate
+from app.core.pagination import Cursor, paginate
 from datetime import datetime
+from typing import Optional
+from app.services.stats import invalidate_dashboard_counts
 
 def get_product(db: Session, product_id: int, user_id: int) -> Product:
     return db.exec(select(Product).where(Product.id == product_id, Product.user_id == user_id)).first()
 
-def get_products(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None):
+def get_product_watermark(db: Session, product_id: int, user_id: int):
+    """Change marker for a single product (its updated_at), used for ETags. None if not found."""
+    return db.exec(
+        select(Product.updated_at).where(Product.id == product_id, Product.user_id == user_id)
+    ).first()
+
+def get_products(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None, after: Optional[Cursor] = None):
     """
     Get products for a user with pagination.
+    Pass `after` (a decoded cursor) for keyset pagination instead of `skip`.
     Returns tuple of (products, total_count, all_count)
     """
     query = select(Product).where(Product.user_id == user_id)
@@ -26,7 +36,7 @@ def get_products(db: Session, user_id: int, skip: int = 0, limit: int = 100, sea
     all_count = db.exec(select(func.count()).where(Product.user_id == user_id)).one()
     
     # Get paginated products
-    products = db.exec(query.offset(skip).limit(limit)).all()
+    products = db.exec(paginate(query, Product, skip=skip, limit=limit, after=after)).all()
     
     return products, total_count, all_count
 
@@ -38,6 +48,7 @@ def create_product(db: Session, product: ProductCreate, user_id: int) -> Product
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
+    invalidate_dashboard_counts(user_id)
     return db_product
 
 def update_product(db: Session, product_id: int, product_update: ProductUpdate, user_id: int) -> Product:
@@ -62,4 +73,5 @@ def delete_product(db: Session, product_id: int, user_id: int) -> bool:
 
     db.delete(db_product)
     db.commit()
+    invalidate_dashboard_counts(user_id)
     return True
@@ -0,0 +1,135 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import Interval, case, cast, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, update
+from app.models.invoice import Invoice, InvoiceItem
+from app.services.rollup import add_to_rollups
+from app.services.stats import invalidate_dashboard_counts
+
+# Supported recurring intervals, as months or fixed durations
+MONTH_INTERVALS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+DAY_INTERVALS = {"daily": 1, "weekly": 7}
+RECURRING_INTERVALS = tuple(DAY_INTERVALS) + tuple(MONTH_INTERVALS)
+
+
+def next_run_after(start: datetime, interval: Optional[str]) -> Optional[datetime]:
+    """
+    Return `start` advanced by one recurring interval, or None if the interval
+    is not supported. Month-based intervals clamp to the last day of the month.
+    """
+    if interval in DAY_INTERVALS:
+        return start + timedelta(days=DAY_INTERVALS[interval])
+    if interval in MONTH_INTERVALS:
+        month_index = start.month - 1 + MONTH_INTERVALS[interval]
+        year = start.year + month_index // 12
+        month = month_index % 12 + 1
+        day = min(start.day, calendar.monthrange(year, month)[1])
+        return start.replace(year=year, month=month, day=day)
+    return None
+
+
+def _interval_step():
+    """SQL expression for one recurring interval of the row's recurring_interval."""
+    return case(
+        *[
+            (Invoice.recurring_interval == name, cast(literal(f"{days} days"), Interval))
+            for name, days in DAY_INTERVALS.items()
+        ],
+        *[
+            (Invoice.recurring_interval == name, cast(literal(f"{months} months"), Interval))
+            for name, months in MONTH_INTERVALS.items()
+        ],
+    )
+
+
+def generate_recurring_batch(db: Session, now: datetime, batch_size: int = 500) -> int:
+    """
+    Generate the next occurrence for up to `batch_size` due recurring invoices
+    and commit. Returns the number of templates processed (0 when none are due).
+
+    Due templates are locked with FOR UPDATE SKIP LOCKED so several workers can
+    run concurrently without picking the same rows. Headers and items are cloned
+    set-wise with INSERT ... SELECT, and next_run_at is advanced in the same
+    transaction, so reruns never generate the same occurrence twice.
+    """
+    template_ids = db.exec(
+        select(Invoice.id)
+        .where(Invoice.next_run_at <= now)
+        .order_by(Invoice.next_run_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not template_ids:
+        db.commit()
+        return 0
+
+    # Occurrences keep the template's payment terms (due_date - created_at)
+    occurrence_columns = select(
+        Invoice.client_id,
+        Invoice.user_id,
+        literal("draft"),
+        Invoice.next_run_at + (Invoice.due_date - Invoice.created_at),
+        Invoice.total_amount,
+        Invoice.currency,
+        literal(False),
+        Invoice.id,
+        literal(now),
+        literal(now),
+    ).where(Invoice.id.in_(template_ids))
+
+    # The (recurring_source_id, due_date) unique index makes a re-generated
+    # occurrence a no-op rather than a duplicate
+    new_rows = db.exec(
+        pg_insert(Invoice)
+        .from_select(
+            [
+                "client_id", "user_id", "status", "due_date", "total_amount", "currency",
+                "is_recurring", "recurring_source_id", "created_at", "updated_at",
+            ],
+            occurrence_columns,
+        )
+        .on_conflict_do_nothing(index_elements=["recurring_source_id", "due_date"])
+        .returning(Invoice.id, Invoice.user_id)
+    ).all()
+    new_ids = [row.id for row in new_rows]
+
+    if new_ids:
+        template_items = (
+            select(Invoice.id, InvoiceItem.product_id, InvoiceItem.quantity, InvoiceItem.unit_price)
+            .join(InvoiceItem, InvoiceItem.invoice_id == Invoice.recurring_source_id)
+            .where(Invoice.id.in_(new_ids))
+        )
+        db.exec(
+            pg_insert(InvoiceItem).from_select(
+                ["invoice_id", "product_id", "quantity", "unit_price"], template_items
+            )
+        )
+        add_to_rollups(db, new_ids)
+
+    db.exec(
+        update(Invoice)
+        .where(Invoice.id.in_(template_ids))
+        .values(next_run_at=Invoice.next_run_at + _interval_step(), updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    for user_id in {row.user_id for row in new_rows}:
+        invalidate_dashboard_counts(user_id)
+    return len(template_ids)
+
+
+def generate_recurring_invoices(db: Session, now: Optional[datetime] = None, batch_size: int = 500) -> int:
+    """
+    Generate every due recurring occurrence, batch by batch, including missed
+    ones (a template that is several intervals behind is picked up again
+    until it catches up). Returns the number of occurrences processed.
+    """
+    now = now or datetime.utcnow()
+    total = 0
+    while True:
+        processed = generate_recurring_batch(db, now, batch_size=batch_size)
+        if not processed:
+            return total
+        total += processed
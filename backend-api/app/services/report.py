@@ -0,0 +1,92 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from sqlmodel import Session, select, func
+from sqlalchemy import and_, case
+from app.models.invoice import Invoice
+from app.models.client import Client
+
+# Invoices that are still owed: issued to the client but not paid or cancelled
+OUTSTANDING_STATUS = "sent"
+
+# Aging buckets in order, as (name, min days past due, max days past due).
+# Days past due count calendar days: an invoice due today is current.
+AGING_BUCKETS = (
+    ("current", None, 0),
+    ("days_1_30", 1, 30),
+    ("days_31_60", 31, 60),
+    ("days_61_90", 61, 90),
+    ("days_90_plus", 91, None),
+)
+
+
+def days_past_due(due_date: datetime, as_of: date) -> int:
+    return max((as_of - due_date.date()).days, 0)
+
+
+def _bucket_condition(as_of: date, min_days, max_days):
+    """due_date range for a bucket, as plain comparisons the index can use."""
+    start_of_day = datetime.combine(as_of, time.min)
+    conditions = []
+    if min_days is not None:
+        conditions.append(Invoice.due_date < start_of_day - timedelta(days=min_days - 1))
+    if max_days is not None:
+        conditions.append(Invoice.due_date >= start_of_day - timedelta(days=max_days))
+    return and_(*conditions)
+
+
+def get_aging_by_client(db: Session, user_id: int, as_of: date, client_id: Optional[int] = None):
+    """
+    Accounts-receivable aging of outstanding invoices per client and currency,
+    computed with a single grouped query.
+    Returns rows of (client_id, client_name, currency, invoice_count, <bucket sums>...)
+    """
+    bucket_sums = [
+        func.coalesce(
+            func.sum(Invoice.total_amount).filter(_bucket_condition(as_of, min_days, max_days)), 0.0
+        ).label(name)
+        for name, min_days, max_days in AGING_BUCKETS
+    ]
+    query = (
+        select(
+            Invoice.client_id,
+            Client.name.label("client_name"),
+            Invoice.currency,
+            func.count().label("invoice_count"),
+            *bucket_sums,
+        )
+        .join(Client, Client.id == Invoice.client_id)
+        .where(Invoice.user_id == user_id, Invoice.status == OUTSTANDING_STATUS)
+        .group_by(Invoice.client_id, Client.name, Invoice.currency)
+        .order_by(Client.name, Invoice.currency)
+    )
+    if client_id is not None:
+        query = query.where(Invoice.client_id == client_id)
+    return db.exec(query).all()
+
+
+def get_aging_invoices(db: Session, user_id: int, client_id: int, as_of: date):
+    """
+    Outstanding invoices of one client with their aging bucket (drill-down).
+    Returns rows of (id, due_date, total_amount, currency, bucket), oldest due first.
+    """
+    bucket = case(
+        *[
+            (_bucket_condition(as_of, min_days, max_days), name)
+            for name, min_days, max_days in AGING_BUCKETS
+        ]
+    )
+    return db.exec(
+        select(
+            Invoice.id,
+            Invoice.due_date,
+            Invoice.total_amount,
+            Invoice.currency,
+            bucket.label("bucket"),
+        )
+        .where(
+            Invoice.user_id == user_id,
+            Invoice.client_id == client_id,
+            Invoice.status == OUTSTANDING_STATUS,
+        )
+        .order_by(Invoice.due_date, Invoice.id)
+    ).all()
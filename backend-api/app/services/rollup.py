@@ -0,0 +1,108 @@
+from datetime import date
+from typing import Iterable, Optional
+from sqlalchemy import Date, DateTime, cast, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, func, delete
+from app.models.invoice import Invoice, InvoiceDailyRollup
+
+# Supported revenue series granularities (date_trunc fields)
+GRANULARITIES = ("day", "week", "month")
+
+ROLLUP_KEY = ["user_id", "day", "status", "currency"]
+
+
+def _upsert_rollups(db: Session, invoice_filter, sign: int = 1) -> int:
+    """
+    Add (sign=1) or subtract (sign=-1) the invoices matched by `invoice_filter`
+    to/from their daily rollup rows with one INSERT ... SELECT ... ON CONFLICT.
+    Rows are written in key order so concurrent writers lock them in the same
+    order and cannot deadlock. Returns the number of rollup rows written.
+    """
+    day = cast(Invoice.created_at, Date)
+    deltas = (
+        select(
+            Invoice.user_id,
+            day,
+            Invoice.status,
+            Invoice.currency,
+            func.count() * literal(sign),
+            func.sum(Invoice.total_amount) * literal(sign),
+        )
+        .where(invoice_filter)
+        .group_by(Invoice.user_id, day, Invoice.status, Invoice.currency)
+        .order_by(Invoice.user_id, day, Invoice.status, Invoice.currency)
+    )
+    statement = pg_insert(InvoiceDailyRollup).from_select(
+        ROLLUP_KEY + ["invoice_count", "total_amount"], deltas
+    )
+    return db.exec(
+        statement.on_conflict_do_update(
+            index_elements=ROLLUP_KEY,
+            set_={
+                "invoice_count": InvoiceDailyRollup.invoice_count + statement.excluded.invoice_count,
+                "total_amount": InvoiceDailyRollup.total_amount + statement.excluded.total_amount,
+            },
+        )
+    ).rowcount
+
+
+def add_to_rollups(db: Session, invoice_ids: Iterable[int]) -> None:
+    """Count invoices in the rollups. Call in the transaction that creates them."""
+    _upsert_rollups(db, Invoice.id.in_(list(invoice_ids)), sign=1)
+
+
+def remove_from_rollups(db: Session, invoice_ids: Iterable[int]) -> None:
+    """Uncount invoices from the rollups. Call before they are changed or deleted."""
+    _upsert_rollups(db, Invoice.id.in_(list(invoice_ids)), sign=-1)
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute the rollups from the invoices table (all users, or one) and commit.
+    The rollup table is locked against concurrent writers for the duration, so
+    invoice writes made meanwhile are applied on top of the rebuilt rows.
+    Returns the number of rollup rows written.
+    """
+    db.connection().exec_driver_sql("LOCK TABLE invoice_daily_rollup IN EXCLUSIVE MODE")
+    if user_id is None:
+        db.exec(delete(InvoiceDailyRollup))
+        count = _upsert_rollups(db, literal(True))
+    else:
+        db.exec(delete(InvoiceDailyRollup).where(InvoiceDailyRollup.user_id == user_id))
+        count = _upsert_rollups(db, Invoice.user_id == user_id)
+    db.commit()
+    return count
+
+
+def get_revenue_series(
+    db: Session,
+    user_id: int,
+    granularity: str = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """
+    Invoice totals per period, status and currency, read from the daily rollups
+    only, so the cost depends on the number of days in range, not of invoices.
+    Weeks start on Monday. Returns rows of (period, status, currency, invoice_count, total_amount).
+    """
+    period = cast(func.date_trunc(granularity, cast(InvoiceDailyRollup.day, DateTime)), Date).label("period")
+    query = (
+        select(
+            period,
+            InvoiceDailyRollup.status,
+            InvoiceDailyRollup.currency,
+            func.sum(InvoiceDailyRollup.invoice_count).label("invoice_count"),
+            func.sum(InvoiceDailyRollup.total_amount).label("total_amount"),
+        )
+        .where(InvoiceDailyRollup.user_id == user_id)
+        .group_by(period, InvoiceDailyRollup.status, InvoiceDailyRollup.currency)
+        # Rows of invoices that later changed status or were deleted drop to zero
+        .having(func.sum(InvoiceDailyRollup.invoice_count) != 0)
+        .order_by(period, InvoiceDailyRollup.status, InvoiceDailyRollup.currency)
+    )
+    if date_from:
+        query = query.where(InvoiceDailyRollup.day >= date_from)
+    if date_to:
+        query = query.where(InvoiceDailyRollup.day <= date_to)
+    return db.exec(query).all()
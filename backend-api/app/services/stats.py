@@ -0,0 +1,69 @@
+from sqlmodel import Session, select, func
+from app.core.cache import TTLCache, listen_for_invalidations
+from app.core.config import settings
+from app.models.user import TENANT_DATA_CHANNEL, User
+from app.models.client import Client
+from app.models.product import Product
+from app.models.invoice import Invoice
+
+# Per-user dashboard counts, invalidated by the client, product and invoice
+# services whenever a write changes them (in this worker), and by
+# TENANT_DATA_CHANNEL notifications (in every worker) with DASHBOARD_CACHE_NOTIFY
+_dashboard_cache = TTLCache(maxsize=settings.DASHBOARD_CACHE_SIZE, ttl=settings.DASHBOARD_CACHE_TTL, name="dashboard")
+
+
+def _scoped_count(model, user_id: int):
+    return select(func.count()).select_from(model).where(model.user_id == user_id).scalar_subquery()
+
+
+def _query_dashboard_counts(db: Session, user_id: int) -> dict:
+    """All dashboard counts in one statement: scalar subqueries plus one filtered aggregate over invoices."""
+    invoice_counts = select(
+        func.count().label("all_count"),
+        func.count().filter(Invoice.status == "draft").label("draft_count"),
+        func.count().filter(Invoice.status == "sent").label("sent_count"),
+        func.count().filter(Invoice.status == "paid").label("paid_count"),
+        func.count().filter(Invoice.status == "cancelled").label("cancelled_count"),
+    ).where(Invoice.user_id == user_id).subquery()
+
+    row = db.exec(
+        select(
+            # Users are not tenant-scoped; this count is only as fresh as the cache TTL
+            select(func.count()).select_from(User).scalar_subquery().label("users_count"),
+            _scoped_count(Client, user_id).label("clients_count"),
+            _scoped_count(Product, user_id).label("products_count"),
+            *invoice_counts.c,
+        )
+    ).one()
+    return {
+        "users_count": row.users_count,
+        "clients_count": row.clients_count,
+        "products_count": row.products_count,
+        "invoices_count": row.all_count,
+        "invoices_status_counts": {
+            "all_count": row.all_count,
+            "draft_count": row.draft_count,
+            "sent_count": row.sent_count,
+            "paid_count": row.paid_count,
+            "cancelled_count": row.cancelled_count,
+        },
+    }
+
+
+def get_dashboard_counts(db: Session, user_id: int) -> dict:
+    """Dashboard counts for a user, served from the cache when fresh."""
+    counts = _dashboard_cache.get(user_id)
+    if counts is None:
+        counts = _query_dashboard_counts(db, user_id)
+        _dashboard_cache.set(user_id, counts)
+    return counts
+
+
+def invalidate_dashboard_counts(user_id: int) -> None:
+    """Drop a user's cached dashboard counts. Call after committing a write that changes them."""
+    _dashboard_cache.invalidate(user_id)
+
+
+async def listen_for_dashboard_changes(retry_seconds: float = 5.0) -> None:
+    """Drop cached dashboard counts of users whose data any worker (or the CLI) changed."""
+    await listen_for_invalidations(_dashboard_cache, TENANT_DATA_CHANNEL, key=int, retry_seconds=retry_seconds)
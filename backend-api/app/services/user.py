@@ -1,22 +1,19 @@
-from sqlmodel import Session, select, func
-from app.models.user import User
+from sqlalchemy import text
+from sqlmodel import Session, select, func, update
+from app.models.user import TenantDataVersion, User
 from typing import Optional
 from app.models.user import UserCreate, UserUpdate
-from passlib.context import CryptContext
+from app.core.cache import TTLCache, listen_for_invalidations
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.core.pagination import Cursor, paginate
 from datetime import datetime
 
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    deprecated="auto",
-    pbkdf2_sha256__default_rounds=30000
-)
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Active users by email (the JWT subject), for get_current_user
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL, name="user")
 
+# Postgres channel carrying the emails of changed users to every worker
+USER_CACHE_CHANNEL = "user_cache_invalidate"
 
 def get_user(db: Session, user_id: int) -> User:
     return db.exec(select(User).where(User.id == user_id)).first()
@@ -26,12 +23,49 @@ def get_user_by_email(db: Session, email: str) -> User:
     return db.exec(select(User).where(User.email == email)).first()
 
 
+def get_data_version(db: Session, user_id: int) -> int:
+    """
+    Change marker for all of a user's clients, products and invoices, used for
+    list ETags. A primary key lookup; 0 until the user's first write.
+    """
+    version = db.exec(select(TenantDataVersion.version).where(TenantDataVersion.user_id == user_id)).first()
+    return version or 0
+
+
+def get_active_user_cached(db: Session, email: str) -> Optional[User]:
+    """
+    User by email for request authentication, served from an in-process cache.
+    Only active users are cached; the cached object is a detached copy, so it
+    is safe to share between requests but must not be added to a session.
+    """
+    user = _user_cache.get(email)
+    if user is None:
+        user = get_user_by_email(db, email)
+        if user is None or not user.is_active:
+            return user
+        user = User.model_validate(user)
+        _user_cache.set(email, user)
+    return user
+
+
+def _notify_user_changed(db: Session, email: str) -> None:
+    """Queue a cross-worker cache invalidation; Postgres delivers it when the transaction commits."""
+    if settings.USER_CACHE_NOTIFY:
+        db.exec(text("SELECT pg_notify(:channel, :email)").bindparams(channel=USER_CACHE_CHANNEL, email=email))
+
+
+async def listen_for_user_changes(retry_seconds: float = 5.0) -> None:
+    """Drop cached users changed by any worker (or the CLI), via LISTEN on USER_CACHE_CHANNEL."""
+    await listen_for_invalidations(_user_cache, USER_CACHE_CHANNEL, retry_seconds=retry_seconds)
+
+
 def get_users(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
     search: Optional[str] = None,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    after: Optional[Cursor] = None
 ):
     """
     Get users with optional search and filter parameters.
@@ -43,6 +77,7 @@ def get_users(
         limit: Maximum number of records to return
         search: Optional search string to filter by email or full_name
         is_active: Optional filter by active status
+        after: Optional decoded cursor for keyset pagination (skip is ignored)
         
     Returns:
         users: List of filtered users
@@ -81,14 +116,15 @@ def get_users(
     ).one()
     
     # Apply pagination and get users
-    paginated_query = query.offset(skip).limit(limit)
+    paginated_query = paginate(query, User, skip=skip, limit=limit, after=after)
     users = db.exec(paginated_query).all()
     
     return users, total_count, all_count, active_count, inactive_count
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    """Create a user. Pass `hashed_password` when the password was already hashed (off the event loop)."""
+    hashed_password = hashed_password or get_password_hash(user.password)
     db_user = User(
         email=user.email,
         full_name=user.full_name,
@@ -100,7 +136,8 @@ def create_user(db: Session, user: UserCreate) -> User:
     return db_user
 
 
-def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
+def update_user(db: Session, user_id: int, user_update: UserUpdate, hashed_password: Optional[str] = None) -> User:
+    """Update a user. Pass `hashed_password` when a new password was already hashed (off the event loop)."""
     db_user = get_user(db, user_id)
     if not db_user:
         return None
@@ -108,23 +145,45 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
     update_data = user_update.model_dump(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        password = update_data.pop("password")
+        update_data["hashed_password"] = hashed_password or get_password_hash(password)
 
+    email = db_user.email
     for field, value in update_data.items():
         setattr(db_user, field, value)
 
     db_user.updated_at = datetime.utcnow()
     db.add(db_user)
+    _notify_user_changed(db, email)
     db.commit()
+    _user_cache.invalidate(email)
     db.refresh(db_user)
     return db_user
 
 
+def rehash_user_password(db: Session, user_id: int, hashed_password: str) -> None:
+    """Replace a user's stored hash with an upgraded one for the same password (after login)."""
+    email = db.exec(
+        update(User)
+        .where(User.id == user_id)
+        .values(hashed_password=hashed_password)
+        .returning(User.email)
+    ).scalar_one_or_none()
+    if email is None:
+        return
+    _notify_user_changed(db, email)
+    db.commit()
+    _user_cache.invalidate(email)
+
+
 def delete_user(db: Session, user_id: int) -> bool:
     db_user = get_user(db, user_id)
     if not db_user:
         return False
 
+    email = db_user.email
     db.delete(db_user)
+    _notify_user_changed(db, email)
     db.commit()
+    _user_cache.invalidate(email)
     return True
\ No newline at end of file
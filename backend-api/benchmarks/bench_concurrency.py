@@ -0,0 +1,87 @@
+"""
+Load benchmark for request concurrency on a single API worker.
+
+Logs in as the benchmark user and keeps N requests in flight against one
+endpoint for a fixed duration at each concurrency level, then reports
+throughput and latency per level. Run it against a single-worker server:
+
+    uvicorn app.main:app --workers 1
+
+With sync route handlers every in-flight request holds a threadpool worker
+(40 by default), so throughput stops growing at that concurrency no matter
+how many connections the database pool allows; with async handlers requests
+wait on the database on the event loop and keep scaling past it.
+
+Requires httpx. Usage (from backend-api/):
+    python -m benchmarks.bench_concurrency --url http://localhost:8000 --levels 10,40,80,160
+"""
+import asyncio
+import json
+import time
+
+import click
+import httpx
+from sqlmodel import Session
+
+from app.core.database import engine
+from benchmarks.common import BENCH_EMAIL, get_bench_fixtures, summarize
+
+# anyio's default threadpool size, the ceiling for sync route handlers
+THREADPOOL_SIZE = 40
+
+
+async def _worker(client: httpx.AsyncClient, path: str, deadline: float, samples, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors.append(1)
+            continue
+        samples.append(time.perf_counter() - start)
+
+
+async def _run_level(url: str, path: str, token: str, concurrency: int, duration: float):
+    samples, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=60) as client:
+        await client.get(path)  # warm up
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _worker(client, path, deadline, samples, errors) for _ in range(concurrency)
+        ))
+    return {
+        "concurrency": concurrency,
+        "throughput_rps": len(samples) / duration,
+        "errors": len(errors),
+        **summarize(samples),
+    }
+
+
+async def _run(url: str, path: str, levels, duration: float):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        response = await client.post("/api/v1/auth/login", data={"username": BENCH_EMAIL, "password": "bench"})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+    return [await _run_level(url, path, token, level, duration) for level in levels]
+
+
+@click.command()
+@click.option("--url", default="http://localhost:8000", help="Base URL of a running API server")
+@click.option("--path", default="/api/v1/invoices/?limit=10", help="Endpoint to load")
+@click.option("--levels", default="10,40,80,160", help="Comma-separated concurrency levels")
+@click.option("--duration", default=10.0, help="Seconds per concurrency level")
+def main(url, path, levels, duration):
+    engine.echo = False
+    with Session(engine) as db:
+        get_bench_fixtures(db)
+
+    levels = [int(level) for level in levels.split(",")]
+    results = asyncio.run(_run(url, path, levels, duration))
+    click.echo(json.dumps({"threadpool_size": THREADPOOL_SIZE, "levels": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
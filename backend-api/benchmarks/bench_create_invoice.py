@@ -0,0 +1,86 @@
+"""
+Latency benchmark for create_invoice.
+
+Compares the previous write path (two commits, per-row item inserts and
+refreshes) with the current one (flush plus a single commit).
+
+Usage (from backend-api/):
+    python -m benchmarks.bench_create_invoice --iterations 500 --items 10
+"""
+import json
+from datetime import datetime, timedelta
+
+import click
+from sqlmodel import Session
+
+from app.core.database import engine
+from app.models.invoice import Invoice, InvoiceCreate, InvoiceItem, InvoiceItemCreate
+from app.services.invoice import create_invoice
+from benchmarks.common import get_bench_fixtures, summarize, timed
+
+
+def _create_invoice_legacy(db: Session, invoice: InvoiceCreate, user_id: int) -> Invoice:
+    """The create_invoice write path before it was made single-commit."""
+    total_amount = sum(item.quantity * item.unit_price for item in invoice.items)
+    db_invoice = Invoice(
+        client_id=invoice.client_id,
+        user_id=user_id,
+        status=invoice.status,
+        due_date=invoice.due_date,
+        currency=invoice.currency,
+        is_recurring=invoice.is_recurring,
+        recurring_interval=invoice.recurring_interval,
+        total_amount=total_amount
+    )
+    db.add(db_invoice)
+    db.commit()
+    db.refresh(db_invoice)
+
+    for item in invoice.items:
+        db.add(InvoiceItem(
+            invoice_id=db_invoice.id,
+            product_id=item.product_id,
+            quantity=item.quantity,
+            unit_price=item.unit_price
+        ))
+
+    db.commit()
+    db.refresh(db_invoice)
+    return db_invoice
+
+
+def _run(create, iterations: int, payload: InvoiceCreate, user_id: int):
+    samples = []
+    for _ in range(iterations):
+        with Session(engine) as db:
+            with timed(samples):
+                invoice = create(db, payload, user_id)
+                # Touch the response graph like the serializer does
+                invoice.client, list(invoice.items)
+    return summarize(samples)
+
+
+@click.command()
+@click.option("--iterations", default=200, help="Invoices created per variant")
+@click.option("--items", default=10, help="Line items per invoice")
+def main(iterations, items):
+    engine.echo = False
+    with Session(engine) as db:
+        user, client, product = get_bench_fixtures(db)
+        user_id, client_id, product_id = user.id, client.id, product.id
+
+    payload = InvoiceCreate(
+        client_id=client_id,
+        due_date=datetime.utcnow() + timedelta(days=30),
+        items=[InvoiceItemCreate(product_id=product_id, quantity=1, unit_price=100.0)] * items
+    )
+
+    results = {
+        "before": _run(_create_invoice_legacy, iterations, payload, user_id),
+        "after": _run(create_invoice, iterations, payload, user_id),
+    }
+    click.echo(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
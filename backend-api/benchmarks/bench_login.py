@@ -0,0 +1,103 @@
+"""
+Login burst benchmark.
+
+Keeps N concurrent logins in flight against a running server for a fixed
+duration while a single probe repeatedly calls a cheap authenticated
+endpoint, then reports login throughput and latency, the probe's latency
+during the burst, and how many logins were shed with 503 once the hashing
+queue (PASSWORD_HASH_MAX_QUEUE) was full.
+
+Password hashing runs on its own executor, so the probe latency should stay
+close to its idle value however many logins are queued.
+
+Requires httpx. Usage (from backend-api/):
+    python -m benchmarks.bench_login --url http://localhost:8000 --concurrency 50 --duration 10
+"""
+import asyncio
+import json
+import time
+
+import click
+import httpx
+from sqlmodel import Session
+
+from app.core.database import engine
+from benchmarks.common import BENCH_EMAIL, get_bench_fixtures, summarize
+
+LOGIN_FORM = {"username": BENCH_EMAIL, "password": "bench"}
+
+
+async def _login_worker(client: httpx.AsyncClient, deadline: float, samples, counts):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/v1/auth/login", data=LOGIN_FORM)
+        except httpx.HTTPError:
+            counts["errors"] += 1
+            continue
+        if response.status_code == 503:
+            counts["rejected"] += 1
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+            continue
+        if response.status_code != 200:
+            counts["errors"] += 1
+            continue
+        samples.append(time.perf_counter() - start)
+
+
+async def _probe(client: httpx.AsyncClient, path: str, deadline: float, samples):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+
+
+async def _run(url: str, path: str, concurrency: int, duration: float):
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        response = await client.post("/api/v1/auth/login", data=LOGIN_FORM)
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        probe_client = httpx.AsyncClient(base_url=url, headers=headers, timeout=60)
+
+        async with probe_client:
+            idle_samples = []
+            await _probe(probe_client, path, time.perf_counter() + min(duration, 2.0), idle_samples)
+
+            login_samples, burst_samples = [], []
+            counts = {"rejected": 0, "errors": 0}
+            deadline = time.perf_counter() + duration
+            await asyncio.gather(
+                _probe(probe_client, path, deadline, burst_samples),
+                *(_login_worker(client, deadline, login_samples, counts) for _ in range(concurrency)),
+            )
+
+    return {
+        "concurrency": concurrency,
+        "login": {
+            "throughput_rps": len(login_samples) / duration,
+            **counts,
+            **summarize(login_samples),
+        },
+        "probe_idle": summarize(idle_samples),
+        "probe_during_burst": summarize(burst_samples),
+    }
+
+
+@click.command()
+@click.option("--url", default="http://localhost:8000", help="Base URL of a running API server")
+@click.option("--path", default="/api/v1/auth/me", help="Cheap endpoint probed during the burst")
+@click.option("--concurrency", default=50, help="Concurrent login requests")
+@click.option("--duration", default=10.0, help="Seconds of sustained logins")
+def main(url, path, concurrency, duration):
+    engine.echo = False
+    with Session(engine) as db:
+        get_bench_fixtures(db)
+
+    click.echo(json.dumps(asyncio.run(_run(url, path, concurrency, duration)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Metrics instrumentation overhead.
+
+Times MetricsMiddleware around a no-op ASGI app (the pure cost of the
+in-flight gauge, label lookup and histogram observation per request), then
+measures the p50 of a real endpoint in-process and reports the overhead as
+a share of it. Exits non-zero above --max-share (1% by default).
+
+Usage (from backend-api/):
+    python -m benchmarks.bench_metrics_overhead --path "/api/v1/invoices/?limit=10"
+"""
+import asyncio
+import json
+import sys
+import time
+
+import click
+import httpx
+from sqlmodel import Session
+
+from app.core.database import engine
+from app.core.metrics import MetricsMiddleware
+from app.main import app
+from benchmarks.common import BENCH_EMAIL, get_bench_fixtures, percentile
+
+SCOPE = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+
+
+async def _noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _noop_send(message):
+    pass
+
+
+async def _middleware_cost(iterations: int) -> float:
+    """Mean seconds per request added by MetricsMiddleware."""
+    bare = _noop_app
+    wrapped = MetricsMiddleware(_noop_app, route_template=lambda scope: "/bench")
+    timings = {}
+    for label, asgi in (("bare", bare), ("wrapped", wrapped)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await asgi(SCOPE, None, _noop_send)
+        timings[label] = (time.perf_counter() - start) / iterations
+    return timings["wrapped"] - timings["bare"]
+
+
+async def _endpoint_p50(path: str, iterations: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/v1/auth/login", data={"username": BENCH_EMAIL, "password": "bench"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+@click.command()
+@click.option("--path", default="/api/v1/invoices/?limit=10", help="Endpoint whose p50 is the baseline")
+@click.option("--iterations", default=200, help="Endpoint requests to time")
+@click.option("--max-share", default=0.01, help="Fail above this overhead / p50 ratio")
+def main(path, iterations, max_share):
+    engine.echo = False
+    with Session(engine) as db:
+        get_bench_fixtures(db)
+
+    overhead = asyncio.run(_middleware_cost(50000))
+    p50 = asyncio.run(_endpoint_p50(path, iterations))
+    share = overhead / p50
+    click.echo(json.dumps({
+        "middleware_overhead_us": overhead * 1e6,
+        "endpoint_p50_ms": p50 * 1000,
+        "overhead_share": share,
+    }, indent=2))
+    if share > max_share:
+        click.echo(f"❌ Metrics overhead is {share:.2%} of p50 (limit {max_share:.0%})")
+        sys.exit(1)
+    click.echo(f"✅ Metrics overhead is {share:.2%} of p50")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Service-layer microbenchmarks.
+
+Seeds (or reuses) a deterministic dataset per size (see benchmarks/datasets.py)
+and times the app/services/* functions against it: list, search, create,
+update, delete and stats. Every call is timed on its own and the statements
+it issues are counted. Mutations clean up after themselves (the invoices
+created are updated and then deleted), so the dataset stays the same
+between runs.
+
+Results are written as JSON; pass a previous results file as --baseline to
+print the p50 change per function.
+
+Usage (from backend-api/):
+    python -m benchmarks.bench_services --sizes 10k,100k --iterations 50 --output services.json
+    python -m benchmarks.bench_services --sizes 10k,100k --baseline services.json
+"""
+import json
+import subprocess
+from datetime import date, datetime, timedelta
+
+import click
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.core.pagination import decode_cursor, next_cursor
+from app.models.client import Client, ClientCreate, ClientUpdate
+from app.models.invoice import InvoiceCreate, InvoiceItemCreate, InvoiceUpdate
+from app.models.product import Product
+from app.services import client as client_service
+from app.services import invoice as invoice_service
+from app.services import product as product_service
+from app.services import report as report_service
+from app.services import rollup as rollup_service
+from app.services import stats as stats_service
+from benchmarks.common import summarize, timed
+from benchmarks.datasets import ANCHOR, ensure_dataset, parse_size
+
+
+class QueryCounter:
+    """Counts statements issued on the sync engine while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._count)
+
+
+def _measure(call, iterations: int, warmup: int = 3) -> dict:
+    """Time `call(i)` for each iteration and count its statements."""
+    for i in range(warmup):
+        call(i)
+    samples, queries = [], []
+    for i in range(warmup, warmup + iterations):
+        with QueryCounter() as counter, timed(samples):
+            call(i)
+        queries.append(counter.count)
+    return {**summarize(samples), "queries_per_call": max(queries)}
+
+
+def _read_benchmarks(db: Session, user_id: int):
+    """(name, call) pairs for the read paths; calls take the iteration number."""
+    page, *_ = invoice_service.get_invoices(db, user_id=user_id, limit=20)
+    cursor = decode_cursor(next_cursor(page, 20))
+    invoice_ids = [invoice.id for invoice in page]
+    client_id = page[0].client_id
+    db.expunge_all()
+
+    return [
+        ("get_invoices", lambda i: invoice_service.get_invoices(db, user_id=user_id, limit=20)),
+        ("get_invoices cursor", lambda i: invoice_service.get_invoices(db, user_id=user_id, limit=20, after=cursor)),
+        ("get_invoices status", lambda i: invoice_service.get_invoices(db, user_id=user_id, limit=20, status="sent")),
+        ("get_invoices summary", lambda i: invoice_service.get_invoices(
+            db, user_id=user_id, limit=20, fields=list(invoice_service.INVOICE_SUMMARY_FIELDS))),
+        ("get_invoices search", lambda i: invoice_service.get_invoices(db, user_id=user_id, limit=20, search="acme")),
+        ("get_invoice", lambda i: invoice_service.get_invoice(db, invoice_id=invoice_ids[i % len(invoice_ids)], user_id=user_id)),
+        ("get_clients", lambda i: client_service.get_clients(db, user_id=user_id, limit=20)),
+        ("get_clients search", lambda i: client_service.get_clients(db, user_id=user_id, limit=20, search="globex")),
+        ("get_products", lambda i: product_service.get_products(db, user_id=user_id, limit=20)),
+        ("dashboard counts", lambda i: stats_service._query_dashboard_counts(db, user_id=user_id)),
+        ("get_aging_by_client", lambda i: report_service.get_aging_by_client(db, user_id=user_id, as_of=ANCHOR.date())),
+        ("get_aging_invoices", lambda i: report_service.get_aging_invoices(
+            db, user_id=user_id, client_id=client_id, as_of=ANCHOR.date())),
+        ("get_revenue_series", lambda i: rollup_service.get_revenue_series(
+            db, user_id=user_id, granularity="month", date_from=date(2024, 1, 1), date_to=ANCHOR.date())),
+    ]
+
+
+def _write_benchmarks(db: Session, user_id: int, iterations: int) -> dict:
+    """create -> update -> delete the same invoices (and clients), timing each step."""
+    client_id = db.exec(select(Client.id).where(Client.user_id == user_id).limit(1)).one()
+    product_id = db.exec(select(Product.id).where(Product.user_id == user_id).limit(1)).one()
+    warmup = 3
+    invoice_ids, client_ids = [], []
+
+    def create_invoice(i):
+        invoice = invoice_service.create_invoice(db, InvoiceCreate(
+            client_id=client_id,
+            due_date=datetime.utcnow() + timedelta(days=30),
+            items=[InvoiceItemCreate(product_id=product_id, quantity=1 + k, unit_price=50.0) for k in range(3)]
+        ), user_id=user_id)
+        invoice_ids.append(invoice.id)
+
+    def update_invoice(i):
+        invoice_service.update_invoice(db, invoice_id=invoice_ids[i], invoice_update=InvoiceUpdate(status="sent"), user_id=user_id)
+
+    def delete_invoice(i):
+        invoice_service.delete_invoice(db, invoice_id=invoice_ids[i], user_id=user_id)
+
+    def create_client(i):
+        client = client_service.create_client(
+            db, ClientCreate(name=f"Bench Write {i}", email=f"write{i}@bench.test"), user_id=user_id
+        )
+        client_ids.append(client.id)
+
+    def update_client(i):
+        client_service.update_client(db, client_id=client_ids[i], client_update=ClientUpdate(address="1 New Street"), user_id=user_id)
+
+    def delete_client(i):
+        client_service.delete_client(db, client_id=client_ids[i], user_id=user_id)
+
+    results = {}
+    for name, call in (
+        ("create_invoice", create_invoice), ("update_invoice", update_invoice), ("delete_invoice", delete_invoice),
+        ("create_client", create_client), ("update_client", update_client), ("delete_client", delete_client),
+    ):
+        results[name] = _measure(call, iterations, warmup=warmup)
+        db.expunge_all()
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_comparison(results: dict, baseline: dict) -> None:
+    for size, functions in results["datasets"].items():
+        previous = baseline["datasets"].get(size)
+        if not previous:
+            continue
+        click.echo(f"\n{size} invoices (vs {baseline['commit']}):")
+        for name, stats in functions.items():
+            if name not in previous or not previous[name]["p50_ms"]:
+                continue
+            change = stats["p50_ms"] / previous[name]["p50_ms"] - 1
+            click.echo(
+                f"  {name:<24} p50 {previous[name]['p50_ms']:8.2f} -> {stats['p50_ms']:8.2f} ms ({change:+.1%})"
+                f"  queries {previous[name]['queries_per_call']} -> {stats['queries_per_call']}"
+            )
+
+
+@click.command()
+@click.option("--sizes", default="10k,100k", help="Comma-separated dataset sizes: 10k, 100k, 1m or a number")
+@click.option("--iterations", default=50, help="Timed calls per function")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write results to this JSON file")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Previous results to compare with")
+def main(sizes, iterations, output, baseline):
+    engine.echo = False
+    results = {"commit": _git_commit(), "created_at": datetime.utcnow().isoformat(), "iterations": iterations, "datasets": {}}
+
+    for size in sizes.split(","):
+        invoices = parse_size(size)
+        with Session(engine) as db:
+            click.echo(f"Preparing dataset of {invoices} invoices...", err=True)
+            user = ensure_dataset(db, invoices)
+            user_id = user.id
+
+            functions = {}
+            for name, call in _read_benchmarks(db, user_id):
+                functions[name] = _measure(call, iterations)
+                db.expunge_all()
+            functions.update(_write_benchmarks(db, user_id, iterations))
+        results["datasets"][str(invoices)] = functions
+
+    click.echo(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"✅ Results saved to {output}", err=True)
+    if baseline:
+        with open(baseline) as f:
+            _print_comparison(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Conditional GET check.
+
+Serves the list endpoints in-process and checks their ETags:
+- a repeated request with its own ETag in If-None-Match gets 304;
+- every other page, filter, search or view of the same list gets a
+  different ETag and answers 200 to the first request's ETag;
+- reordering the query parameters does not change the ETag.
+Exits non-zero on any failure.
+
+Usage (from backend-api/):
+    python -m benchmarks.check_etags
+"""
+import sys
+
+import click
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.database import engine
+from app.main import app
+from benchmarks.check_request_budgets import _ensure_invoices
+from benchmarks.common import BENCH_EMAIL
+
+# (base path, variants that must not share its ETag)
+LISTS = [
+    ("/api/v1/invoices/?limit=5", [
+        "/api/v1/invoices/?limit=5&skip=5",
+        "/api/v1/invoices/?limit=10",
+        "/api/v1/invoices/?limit=5&status=draft",
+        "/api/v1/invoices/?limit=5&search=bench",
+        "/api/v1/invoices/?limit=5&view=summary",
+        "/api/v1/invoices/?limit=5&fields=status,total_amount",
+    ]),
+    ("/api/v1/clients/?limit=5", ["/api/v1/clients/?limit=5&skip=5", "/api/v1/clients/?limit=5&search=bench"]),
+    ("/api/v1/products/?limit=5", ["/api/v1/products/?limit=5&skip=5", "/api/v1/products/?limit=5&search=bench"]),
+]
+
+# (path, same query in another order)
+REORDERED = [
+    ("/api/v1/invoices/?limit=5&status=draft", "/api/v1/invoices/?status=draft&limit=5"),
+]
+
+
+@click.command()
+def main():
+    engine.echo = False
+    with Session(engine) as db:
+        _ensure_invoices(db, 20)
+
+    failures = []
+    with TestClient(app) as client:
+        response = client.post("/api/v1/auth/login", data={"username": BENCH_EMAIL, "password": "bench"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        def get(path, etag=None):
+            response = client.get(path, headers={**headers, **({"If-None-Match": etag} if etag else {})})
+            if response.status_code not in (200, 304):
+                response.raise_for_status()
+            return response
+
+        for base, variants in LISTS:
+            etag = get(base).headers["etag"]
+            if get(base, etag).status_code != 304:
+                failures.append(f"{base}: its own ETag did not give 304")
+            for variant in variants:
+                response = get(variant, etag)
+                if response.status_code == 304 or response.headers["etag"] == etag:
+                    failures.append(f"{variant}: shares the ETag of {base}")
+
+        # One list's cursor page must not match its first page either
+        first = get("/api/v1/invoices/?limit=5").json()
+        if first["meta"].get("next_cursor"):
+            etag = get("/api/v1/invoices/?limit=5").headers["etag"]
+            cursor_page = f"/api/v1/invoices/?limit=5&cursor={first['meta']['next_cursor']}"
+            if get(cursor_page, etag).status_code == 304:
+                failures.append(f"{cursor_page}: shares the ETag of the first page")
+
+        for path, reordered in REORDERED:
+            if get(path).headers["etag"] != get(reordered).headers["etag"]:
+                failures.append(f"{reordered}: ETag depends on parameter order")
+
+    for failure in failures:
+        click.echo(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    click.echo("✅ List ETags vary with the query and match on repeat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Query-plan check for the service layer.
+
+Runs the read paths of app/services/* against DATABASE_URL for the tenant
+with the most invoices, captures every SQL statement they issue, and runs
+EXPLAIN on each one. Exits non-zero if any plan contains a sequential scan
+on one of the large tenant tables. Seed a realistic dataset first (the
+planner prefers sequential scans on small tables).
+
+Usage (from backend-api/):
+    python -m benchmarks.check_query_plans
+"""
+import json
+import sys
+from datetime import date
+
+import click
+from sqlalchemy import event
+from sqlmodel import Session, func, select
+
+from app.core.database import engine
+from app.core.pagination import decode_cursor, next_cursor
+from app.models.invoice import Invoice
+from app.services import client as client_service
+from app.services import invoice as invoice_service
+from app.services import product as product_service
+from app.services import report as report_service
+from app.services import user as user_service
+
+# Tables that grow with tenant data and must never be scanned in full
+LARGE_TABLES = {"invoices", "invoice_items", "clients", "products"}
+
+
+def _service_calls(db: Session, user_id: int):
+    """(label, callable) pairs covering the service read paths."""
+    invoices, *_ = invoice_service.get_invoices(db, user_id=user_id, limit=10)
+    cursor = next_cursor(invoices, 10)
+    invoice_id = invoices[0].id if invoices else 0
+    client_id = invoices[0].client_id if invoices else 0
+    product_id = invoices[0].items[0].product_id if invoices and invoices[0].items else 0
+
+    return [
+        ("get_invoices", lambda: invoice_service.get_invoices(db, user_id=user_id, limit=10)),
+        ("get_invoices status", lambda: invoice_service.get_invoices(db, user_id=user_id, limit=10, status="paid")),
+        ("get_invoices search", lambda: invoice_service.get_invoices(db, user_id=user_id, limit=10, search="acme")),
+        ("get_invoices search amount", lambda: invoice_service.get_invoices(
+            db, user_id=user_id, limit=10, search="12345.67")),
+        ("get_invoices summary", lambda: invoice_service.get_invoices(
+            db, user_id=user_id, limit=10, fields=list(invoice_service.INVOICE_SUMMARY_FIELDS))),
+        ("get_invoices cursor", lambda: invoice_service.get_invoices(
+            db, user_id=user_id, limit=10, after=decode_cursor(cursor) if cursor else None)),
+        ("get_invoice", lambda: invoice_service.get_invoice(db, invoice_id=invoice_id, user_id=user_id)),
+        ("get_invoice_watermark", lambda: invoice_service.get_invoice_watermark(db, invoice_id=invoice_id, user_id=user_id)),
+        ("get_data_version", lambda: user_service.get_data_version(db, user_id=user_id)),
+        ("get_invoice_pdf_payloads", lambda: invoice_service.get_invoice_pdf_payloads(db, [invoice_id], user_id=user_id)),
+        ("get_clients", lambda: client_service.get_clients(db, user_id=user_id, limit=10)),
+        ("get_clients search", lambda: client_service.get_clients(db, user_id=user_id, limit=10, search="acme")),
+        ("get_client", lambda: client_service.get_client(db, client_id=client_id, user_id=user_id)),
+        ("get_products", lambda: product_service.get_products(db, user_id=user_id, limit=10)),
+        ("get_product", lambda: product_service.get_product(db, product_id=product_id, user_id=user_id)),
+        ("get_aging_by_client", lambda: report_service.get_aging_by_client(db, user_id=user_id, as_of=date.today())),
+        ("get_aging_invoices", lambda: report_service.get_aging_invoices(
+            db, user_id=user_id, client_id=client_id, as_of=date.today())),
+    ]
+
+
+def _seq_scans(plan: dict):
+    """Yield relation names of Seq Scan nodes in an EXPLAIN (FORMAT JSON) plan tree."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+@click.command()
+@click.option("--min-invoices", default=1000000, help="Refuse to run on a tenant smaller than this")
+def main(min_invoices):
+    engine.echo = False
+    with Session(engine) as db:
+        top = db.exec(
+            select(Invoice.user_id, func.count().label("n"))
+            .group_by(Invoice.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).first()
+        if not top or top.n < min_invoices:
+            click.echo(f"❌ Largest tenant has {top.n if top else 0} invoices; seed at least {min_invoices}.")
+            sys.exit(2)
+        user_id = top.user_id
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        failures = []
+        for label, call in _service_calls(db, user_id):
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                call()
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+
+            for statement, parameters in captured:
+                if not statement.lstrip().upper().startswith("SELECT"):
+                    continue
+                explain = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = explain.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                scanned = sorted(set(_seq_scans(plan[0]["Plan"])) & LARGE_TABLES)
+                status = "❌" if scanned else "✅"
+                click.echo(f"{status} {label}: seq scans on {', '.join(scanned) or 'none'}")
+                if scanned:
+                    failures.append((label, scanned, statement))
+
+    if failures:
+        click.echo(f"\n{len(failures)} statement(s) use sequential scans on large tables:")
+        for label, scanned, statement in failures:
+            click.echo(f"--- {label} ({', '.join(scanned)})\n{statement}")
+        sys.exit(1)
+    click.echo(f"\n✅ No sequential scans on {', '.join(sorted(LARGE_TABLES))}")
+
+
+if __name__ == "__main__":
+    main()
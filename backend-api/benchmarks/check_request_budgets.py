@@ -0,0 +1,85 @@
+"""
+Request budget check.
+
+Serves the budgeted routes in-process with REQUEST_BUDGET_STRICT on, so a
+request that issues more statements (or takes longer) than its budget fails
+instead of only logging a warning. The user and dashboard caches are cleared
+before each request to measure the cache-miss path. Exits non-zero on any
+violation; the same strict setting makes violations fail a TestClient-based
+test suite.
+
+Usage (from backend-api/):
+    python -m benchmarks.check_request_budgets
+"""
+import sys
+from datetime import datetime, timedelta
+
+import click
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.instrumentation import RequestBudgetExceeded
+from app.main import app
+from app.models.invoice import Invoice, InvoiceCreate, InvoiceItemCreate
+from app.services import stats as stats_service
+from app.services import user as user_service
+from app.services.invoice import create_invoice
+from benchmarks.common import BENCH_EMAIL, get_bench_fixtures
+
+# (label, path) for every budgeted route variant
+CHECKS = [
+    ("list_invoices", "/api/v1/invoices/?limit=10"),
+    ("list_invoices status", "/api/v1/invoices/?limit=10&status=draft"),
+    ("list_invoices summary", "/api/v1/invoices/?limit=10&view=summary"),
+    ("list_invoices fields", "/api/v1/invoices/?limit=10&fields=status,total_amount"),
+    ("get_dashboard_stats", "/api/v1/stats/"),
+]
+
+
+def _ensure_invoices(db: Session, count: int) -> None:
+    user, client, product = get_bench_fixtures(db)
+    existing = db.exec(select(Invoice.id).where(Invoice.user_id == user.id).limit(count)).all()
+    for _ in range(count - len(existing)):
+        create_invoice(db, InvoiceCreate(
+            client_id=client.id,
+            due_date=datetime.utcnow() + timedelta(days=30),
+            items=[InvoiceItemCreate(product_id=product.id, quantity=2, unit_price=product.price)] * 3
+        ), user_id=user.id)
+
+
+@click.command()
+@click.option("--invoices", default=20, help="Invoices to make sure the benchmark user has")
+def main(invoices):
+    engine.echo = False
+    with Session(engine) as db:
+        _ensure_invoices(db, invoices)
+
+    settings.REQUEST_BUDGET_STRICT = True
+    failures = []
+    with TestClient(app) as client:
+        response = client.post("/api/v1/auth/login", data={"username": BENCH_EMAIL, "password": "bench"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for label, path in CHECKS:
+            user_service._user_cache.clear()
+            stats_service._dashboard_cache.clear()
+            try:
+                response = client.get(path, headers=headers)
+                response.raise_for_status()
+            except RequestBudgetExceeded as e:
+                click.echo(f"❌ {label}: {e.args[0]}")
+                failures.append(label)
+                continue
+            click.echo(f"✅ {label}: {response.headers.get('server-timing')}")
+
+    if failures:
+        click.echo(f"\n{len(failures)} request(s) over budget")
+        sys.exit(1)
+    click.echo("\n✅ All requests within budget")
+
+
+if __name__ == "__main__":
+    main()
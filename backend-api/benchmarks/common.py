@@ -0,0 +1,62 @@
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from sqlmodel import Session, select
+
+from app.models.user import UserCreate
+from app.models.client import Client, ClientCreate
+from app.models.product import Product, ProductCreate
+from app.services.user import create_user, get_user_by_email
+from app.services.client import create_client
+from app.services.product import create_product
+
+BENCH_EMAIL = "bench@example.com"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0-100)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+@contextmanager
+def timed(samples: List[float]):
+    """Append the wall-clock duration of the block to `samples`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - start)
+
+
+def get_bench_fixtures(db: Session):
+    """Return (user, client, product) owned by the benchmark user, creating them if needed."""
+    user = get_user_by_email(db, BENCH_EMAIL)
+    if not user:
+        user = create_user(db, UserCreate(email=BENCH_EMAIL, full_name="Bench User", password="bench"))
+
+    client = db.exec(select(Client).where(Client.user_id == user.id)).first()
+    if not client:
+        client = create_client(db, ClientCreate(name="Bench Client", email="client@bench.com"), user_id=user.id)
+
+    product = db.exec(select(Product).where(Product.user_id == user.id)).first()
+    if not product:
+        product = create_product(db, ProductCreate(name="Bench Product", price=100.0), user_id=user.id)
+
+    return user, client, product
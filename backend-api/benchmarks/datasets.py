@@ -0,0 +1,122 @@
+"""
+Deterministic benchmark datasets.
+
+Each dataset is one tenant (bench-<size>@example.com) whose clients,
+products, invoices and items are generated set-wise with generate_series:
+every value is a function of the row number and a fixed anchor date, so a
+given size always produces the same data (up to serial ids). Seeding is
+skipped when the tenant already has the expected number of invoices.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlmodel import Session, delete, func, select
+
+from app.models.client import Client
+from app.models.invoice import Invoice, InvoiceItem
+from app.models.product import Product
+from app.models.user import UserCreate
+from app.services.rollup import rebuild_rollups
+from app.services.user import create_user, get_user_by_email
+
+ANCHOR = datetime(2026, 1, 1)
+ITEMS_PER_INVOICE = 3
+PRODUCTS = 200
+CLIENT_NAMES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell")
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+_SEED_CLIENTS = text("""
+    INSERT INTO clients (name, email, address, created_at, updated_at, user_id)
+    SELECT (:names)[1 + n % cardinality(:names)] || ' ' || n,
+           'billing' || n || '@' || lower((:names)[1 + n % cardinality(:names)]) || '.test',
+           n || ' Main Street',
+           :anchor - make_interval(days => n % 730), :anchor - make_interval(days => n % 730),
+           :user_id
+    FROM generate_series(1, :count) AS n
+""")
+
+_SEED_PRODUCTS = text("""
+    INSERT INTO products (name, description, price, currency, created_at, updated_at, user_id)
+    SELECT 'Product ' || n, 'Benchmark product ' || n, 10 + (n * 37) % 490, 'USD',
+           :anchor - make_interval(days => n % 730), :anchor - make_interval(days => n % 730),
+           :user_id
+    FROM generate_series(1, :count) AS n
+""")
+
+# Status mix 20% draft, 30% sent, 40% paid, 10% cancelled; every fifth invoice in EUR.
+# total_amount is the sum of the item formula below over k = 0..ITEMS_PER_INVOICE-1.
+_SEED_INVOICES = text("""
+    WITH client_ids AS (
+        SELECT array_agg(id ORDER BY id) AS ids FROM clients WHERE user_id = :user_id
+    )
+    INSERT INTO invoices (client_id, user_id, status, due_date, total_amount, currency,
+                          is_recurring, created_at, updated_at)
+    SELECT client_ids.ids[1 + (n * 7) % cardinality(client_ids.ids)],
+           :user_id,
+           (ARRAY['draft','draft','sent','sent','sent','paid','paid','paid','paid','cancelled'])[1 + n % 10],
+           :anchor - make_interval(days => n % 730, secs => n) + interval '30 days',
+           (SELECT sum((1 + (n + k) % 5) * (10 + (n * 7 + k * 13) % 90))
+            FROM generate_series(0, :items - 1) AS k),
+           CASE WHEN n % 5 = 0 THEN 'EUR' ELSE 'USD' END,
+           false,
+           :anchor - make_interval(days => n % 730, secs => n),
+           :anchor - make_interval(days => n % 730, secs => n)
+    FROM generate_series(1, :count) AS n, client_ids
+    ORDER BY n
+""")
+
+_SEED_ITEMS = text("""
+    WITH numbered AS (
+        SELECT id, row_number() OVER (ORDER BY id) AS n FROM invoices WHERE user_id = :user_id
+    ), product_ids AS (
+        SELECT array_agg(id ORDER BY id) AS ids FROM products WHERE user_id = :user_id
+    )
+    INSERT INTO invoice_items (invoice_id, product_id, quantity, unit_price)
+    SELECT numbered.id,
+           product_ids.ids[1 + (numbered.n + k) % cardinality(product_ids.ids)],
+           1 + (numbered.n + k) % 5,
+           10 + (numbered.n * 7 + k * 13) % 90
+    FROM numbered, product_ids, generate_series(0, :items - 1) AS k
+""")
+
+
+def parse_size(size: str) -> int:
+    """'10k', '100k', '1m' or a plain number of invoices."""
+    size = size.strip().lower()
+    if size in SIZES:
+        return SIZES[size]
+    return int(size)
+
+
+def _reset_tenant(db: Session, user_id: int) -> None:
+    invoice_ids = select(Invoice.id).where(Invoice.user_id == user_id)
+    db.exec(delete(InvoiceItem).where(InvoiceItem.invoice_id.in_(invoice_ids)))
+    db.exec(delete(Invoice).where(Invoice.user_id == user_id))
+    db.exec(delete(Client).where(Client.user_id == user_id))
+    db.exec(delete(Product).where(Product.user_id == user_id))
+    db.commit()
+
+
+def ensure_dataset(db: Session, invoices: int):
+    """Return the tenant user for a dataset of `invoices` invoices, seeding it if needed."""
+    email = f"bench-{invoices}@example.com"
+    user = get_user_by_email(db, email)
+    if not user:
+        user = create_user(db, UserCreate(email=email, full_name=f"Bench {invoices}", password="bench"))
+
+    existing = db.exec(select(func.count()).select_from(Invoice).where(Invoice.user_id == user.id)).one()
+    if existing == invoices:
+        return user
+
+    _reset_tenant(db, user.id)
+    params = {"user_id": user.id, "anchor": ANCHOR}
+    db.exec(_SEED_CLIENTS, params={**params, "names": list(CLIENT_NAMES), "count": max(50, invoices // 100)})
+    db.exec(_SEED_PRODUCTS, params={**params, "count": PRODUCTS})
+    db.exec(_SEED_INVOICES, params={**params, "count": invoices, "items": ITEMS_PER_INVOICE})
+    db.exec(_SEED_ITEMS, params={"user_id": user.id, "items": ITEMS_PER_INVOICE})
+    db.commit()
+    rebuild_rollups(db, user_id=user.id)
+    db.exec(text("ANALYZE clients, products, invoices, invoice_items"))
+    db.commit()
+    return user
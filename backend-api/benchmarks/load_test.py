@@ -0,0 +1,263 @@
+"""
+Load test built on the verify_invoice_app.py flow.
+
+Each tenant is set up the way verify_invoice_app.py does it (register,
+login, create a client and a product), then `--concurrency` virtual users
+run weighted scenarios back to back for `--duration` seconds:
+
+    browse     list invoices, follow the next-page cursor, open one invoice
+    create     create an invoice with a few items
+    dashboard  dashboard stats
+
+Results (throughput, p50/p95/p99 per scenario) are printed as JSON and can
+be saved as a baseline; a later run given `--baseline` reports the change
+per scenario and exits non-zero when throughput drops or p95 grows by more
+than `--max-regression`. Scenario choice is seeded, so runs with the same
+options issue the same mix of requests.
+
+Runs against any server URL, or starts one itself with `--start-server`
+(uvicorn on DATABASE_URL, e.g. a local, dockerless Postgres). The API needs
+Postgres; there is no SQLite mode.
+
+Requires httpx. Usage (from backend-api/):
+    python -m benchmarks.load_test --start-server --concurrency 20 --duration 30 --save-baseline baseline.json
+    python -m benchmarks.load_test --start-server --concurrency 20 --duration 30 --baseline baseline.json
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import click
+import httpx
+
+from benchmarks.common import summarize
+
+DEFAULT_MIX = "browse=70,create=20,dashboard=10"
+TENANT_PASSWORD = "password123"
+
+
+async def _setup_tenant(client: httpx.AsyncClient, index: int) -> dict:
+    """Register/login a tenant and create its client and product (the verify_invoice_app flow)."""
+    email = f"load-{index}@example.com"
+    login_data = {"username": email, "password": TENANT_PASSWORD}
+    response = await client.post("/api/v1/auth/login", data=login_data)
+    if response.status_code != 200:
+        response = await client.post("/api/v1/users/", json={
+            "email": email, "full_name": f"Load Tenant {index}", "password": TENANT_PASSWORD
+        })
+        if response.status_code not in (201, 400):
+            response.raise_for_status()
+        response = await client.post("/api/v1/auth/login", data=login_data)
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.post("/api/v1/clients/", headers=headers, json={
+        "name": f"Load Client {index}", "email": f"client-{index}@load.test", "address": "123 Test St"
+    })
+    response.raise_for_status()
+    client_id = response.json()["id"]
+
+    response = await client.post("/api/v1/products/", headers=headers, json={
+        "name": f"Load Product {index}", "description": "A test product", "price": 100.0, "currency": "USD"
+    })
+    response.raise_for_status()
+    return {"headers": headers, "client_id": client_id, "product_id": response.json()["id"]}
+
+
+async def _browse(client: httpx.AsyncClient, tenant: dict, rng: random.Random):
+    response = await client.get("/api/v1/invoices/?limit=10", headers=tenant["headers"])
+    response.raise_for_status()
+    page = response.json()
+    if page["meta"].get("next_cursor"):
+        response = await client.get(f"/api/v1/invoices/?limit=10&cursor={page['meta']['next_cursor']}", headers=tenant["headers"])
+        response.raise_for_status()
+    if page["data"]:
+        invoice_id = rng.choice(page["data"])["id"]
+        response = await client.get(f"/api/v1/invoices/{invoice_id}", headers=tenant["headers"])
+        response.raise_for_status()
+
+
+async def _create(client: httpx.AsyncClient, tenant: dict, rng: random.Random):
+    due_date = datetime.utcnow() + timedelta(days=rng.choice((14, 30, 60)))
+    response = await client.post("/api/v1/invoices/", headers=tenant["headers"], json={
+        "client_id": tenant["client_id"],
+        "due_date": due_date.isoformat(),
+        "status": rng.choice(("draft", "sent", "paid")),
+        "currency": "USD",
+        "items": [
+            {"product_id": tenant["product_id"], "quantity": rng.randint(1, 5), "unit_price": 100.0}
+            for _ in range(rng.randint(1, 5))
+        ]
+    })
+    response.raise_for_status()
+
+
+async def _dashboard(client: httpx.AsyncClient, tenant: dict, rng: random.Random):
+    response = await client.get("/api/v1/stats/", headers=tenant["headers"])
+    response.raise_for_status()
+
+
+SCENARIOS = {"browse": _browse, "create": _create, "dashboard": _dashboard}
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise click.BadParameter(f"Unknown scenario: {name.strip()}", param_hint="--mix")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+async def _virtual_user(client, tenant, weights: dict, rng: random.Random, deadline: float, samples, errors):
+    names, scenario_weights = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights=scenario_weights)[0]
+        start = time.perf_counter()
+        try:
+            await SCENARIOS[name](client, tenant, rng)
+        except httpx.HTTPError:
+            errors[name] += 1
+            continue
+        samples[name].append(time.perf_counter() - start)
+
+
+async def _run(url: str, concurrency: int, duration: float, tenants: int, weights: dict, seed: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        tenant_fixtures = [await _setup_tenant(client, index) for index in range(tenants)]
+        # Give every tenant a few pages of invoices before measuring
+        warmup_rng = random.Random(seed)
+        for tenant in tenant_fixtures:
+            await asyncio.gather(*(_create(client, tenant, warmup_rng) for _ in range(25)))
+
+        samples = {name: [] for name in weights}
+        errors = {name: 0 for name in weights}
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _virtual_user(
+                client, tenant_fixtures[index % tenants], weights,
+                random.Random(seed + index), deadline, samples, errors
+            )
+            for index in range(concurrency)
+        ))
+
+    all_samples = [sample for values in samples.values() for sample in values]
+    return {
+        "total": {
+            "throughput_rps": len(all_samples) / duration,
+            "errors": sum(errors.values()),
+            **summarize(all_samples),
+        },
+        "scenarios": {
+            name: {
+                "throughput_rps": len(samples[name]) / duration,
+                "errors": errors[name],
+                **summarize(samples[name]),
+            }
+            for name in weights
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Print per-scenario changes against a baseline and return the regressions."""
+    regressions = []
+    rows = [("total", results["total"], baseline["results"]["total"])]
+    rows += [
+        (name, stats, baseline["results"]["scenarios"][name])
+        for name, stats in results["scenarios"].items()
+        if name in baseline["results"]["scenarios"]
+    ]
+    for name, current, previous in rows:
+        throughput = current["throughput_rps"] / previous["throughput_rps"] - 1 if previous["throughput_rps"] else 0.0
+        p95 = current["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0.0
+        regressed = throughput < -max_regression or p95 > max_regression
+        click.echo(
+            f"{'❌' if regressed else '✅'} {name}: throughput {throughput:+.1%}, "
+            f"p95 {previous['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms ({p95:+.1%})"
+        )
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@contextmanager
+def _local_server(port: int):
+    """Run the API under uvicorn (one worker) on DATABASE_URL for the duration of the test."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "DB_ECHO": "false"}
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/docs", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            raise click.ClickException("Server did not start")
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@click.command()
+@click.option("--url", default="http://localhost:8000", help="Base URL of a running API server")
+@click.option("--start-server", is_flag=True, help="Start uvicorn on DATABASE_URL instead of using --url")
+@click.option("--port", default=8765, help="Port for --start-server")
+@click.option("--concurrency", default=20, help="Concurrent virtual users")
+@click.option("--duration", default=30.0, help="Seconds of measured load")
+@click.option("--tenants", default=4, help="Tenants the virtual users are spread over")
+@click.option("--mix", default=DEFAULT_MIX, help="Scenario weights, e.g. browse=70,create=20,dashboard=10")
+@click.option("--seed", default=42, help="Seed for scenario choice and request payloads")
+@click.option("--save-baseline", type=click.Path(dir_okay=False), help="Write the results to this JSON file")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Compare with a saved baseline")
+@click.option("--max-regression", default=0.10, help="Allowed throughput drop / p95 growth against the baseline")
+def main(url, start_server, port, concurrency, duration, tenants, mix, seed, save_baseline, baseline, max_regression):
+    weights = parse_mix(mix)
+    options = {"concurrency": concurrency, "duration": duration, "tenants": tenants, "mix": weights, "seed": seed}
+
+    if start_server:
+        with _local_server(port) as local_url:
+            results = asyncio.run(_run(local_url, concurrency, duration, tenants, weights, seed))
+    else:
+        results = asyncio.run(_run(url, concurrency, duration, tenants, weights, seed))
+
+    report = {"commit": _git_commit(), "created_at": datetime.utcnow().isoformat(), "options": options, "results": results}
+    click.echo(json.dumps(report, indent=2))
+
+    if save_baseline:
+        with open(save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        click.echo(f"✅ Baseline saved to {save_baseline}")
+
+    if baseline:
+        with open(baseline) as f:
+            previous = json.load(f)
+        if previous["options"] != options:
+            click.echo(f"⚠️  Baseline was recorded with different options: {previous['options']}")
+        click.echo(f"\nCompared with {previous['commit']} ({previous['created_at']}):")
+        if compare(results, previous, max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()